@@ -0,0 +1,17 @@
+"""Benchmarks for the colormaps package.
+
+The benchmarks follow the conventions of airspeed velocity (asv): each
+module defines classes whose ``time_*`` methods are timed, optionally
+parametrized by the ``params`` and ``param_names`` class attributes.
+Each module can also be run directly, for example::
+
+    python -m benchmarks.parsing
+
+or the whole suite run, saving the results as JSON, with::
+
+    python -m benchmarks -o results.json
+
+The suite can also be run by asv itself, configured by ``asv.conf.json``
+at the top of the repository.
+
+"""
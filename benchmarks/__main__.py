@@ -0,0 +1,87 @@
+"""Run all of the benchmarks and optionally save the results.
+
+Run as::
+
+    python -m benchmarks [-o RESULTS.json] [MODULE ...]
+
+The results file records the benchmark results together with the git
+commit and the versions of Python and the dependencies, so that files
+saved for different commits can be compared. The suite can also be run
+with asv (see ``asv.conf.json``), which keeps its own results.
+
+"""
+from __future__ import absolute_import, print_function
+import argparse
+import importlib
+import inspect
+import json
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from .common import run
+
+
+_MODULES = ['imports', 'parsing', 'loading', 'creation', 'colorize']
+
+
+def _benchmark_classes(module):
+    return [obj for _, obj in sorted(vars(module).items())
+            if inspect.isclass(obj) and obj.__module__ == module.__name__ and
+            any(name.startswith(('time_', 'track_')) for name in dir(obj))]
+
+
+def _commit():
+    try:
+        output = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                         stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode('ascii').strip()
+
+
+def _versions():
+    versions = {'python': platform.python_version(), 'numpy': np.__version__}
+    try:
+        import matplotlib
+    except ImportError:
+        pass
+    else:
+        versions['matplotlib'] = matplotlib.__version__
+    return versions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Run the colormaps benchmarks.')
+    parser.add_argument('modules', nargs='*', metavar='MODULE',
+                        default=_MODULES,
+                        help='benchmark modules to run (default: all)')
+    parser.add_argument('-o', '--output',
+                        help='JSON file to save the results to')
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help='number of timing repeats (default: '
+                             '%(default)s)')
+    args = parser.parse_args(argv)
+    results = []
+    for name in args.modules:
+        module = importlib.import_module('benchmarks.' + name)
+        results.extend(run(*_benchmark_classes(module), repeat=args.repeat))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'commit': _commit(),
+                       'date': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                       'machine': platform.node(),
+                       'platform': platform.platform(),
+                       'versions': _versions(),
+                       'results': results}, f, indent=1)
+        print('saved {:d} results to {!s}'.format(len(results), args.output),
+              file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
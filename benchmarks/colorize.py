@@ -0,0 +1,132 @@
+"""Benchmarks for mapping data to colors."""
+from __future__ import absolute_import
+
+import numpy as np
+from matplotlib.colors import BoundaryNorm, Normalize
+
+from colormaps import (apply,
+                       apply_levels,
+                       create_colormap,
+                       create_level_colormap,)
+
+
+# Precipitation levels for the ncl_precip_11lev base.
+_LEVELS = [.1, .5, 1, 2, 5, 10, 15, 20, 30, 50]
+
+
+def _field(megapixels):
+    """Return a field of random data with *megapixels* million values."""
+    return np.random.RandomState(0).normal(size=(1000 * megapixels, 1000))
+
+
+class TimeApply(object):
+    """Colorize fields of 1 to 100 megapixels."""
+
+    params = [[1, 10, 100], [False, True], [False, True]]
+    param_names = ['megapixels', 'reverse', 'white']
+    timeout = 300
+
+    def setup(self, megapixels, reverse, white):
+        self.data = _field(megapixels)
+        self.out = np.empty(self.data.shape + (4,), dtype=np.uint8)
+
+    def time_apply(self, megapixels, reverse, white):
+        apply(self.data, base='ncl_amwg256', vmin=-3, vmax=3,
+              reverse=reverse, white=white, out=self.out)
+
+
+class TimeMatplotlib(object):
+    """Colorize fields with matplotlib, for comparison with `TimeApply`.
+
+    matplotlib allocates several float64 copies of the data, so the
+    largest field is left out.
+
+    """
+
+    params = [[1, 10]]
+    param_names = ['megapixels']
+
+    def setup(self, megapixels):
+        self.data = _field(megapixels)
+        self.cmap = create_colormap(256, base='ncl_amwg256')
+        self.norm = Normalize(-3, 3)
+
+    def time_matplotlib(self, megapixels):
+        self.cmap(self.norm(self.data), bytes=True)
+
+
+class TimeApplyThreads(object):
+    """Colorize a 36 megapixel field with a pool of threads."""
+
+    params = [[1, 2, 4, 8]]
+    param_names = ['threads']
+
+    def setup(self, threads):
+        self.data = np.random.RandomState(0).normal(size=(6000, 6000))
+        self.out = np.empty(self.data.shape + (4,), dtype=np.uint8)
+
+    def time_apply(self, threads):
+        apply(self.data, base='ncl_amwg256', vmin=-3, vmax=3, out=self.out,
+              chunksize=1 << 18, threads=threads)
+
+
+def _precipitation(megapixels):
+    """Return a float32 field of *megapixels* million rainfall values."""
+    field = np.empty((1000 * megapixels, 1000), dtype=np.float32)
+    random = np.random.RandomState(0)
+    # Fill a block at a time to avoid a float64 copy of a large field.
+    for start in range(0, field.shape[0], 1000):
+        field[start:start + 1000] = random.gamma(.5, 8., size=(1000, 1000))
+    return field
+
+
+class TimeLevels(object):
+    """Colorize rainfall fields of 1 to 100 megapixels at fixed levels."""
+
+    params = [[1, 10, 100], ['neither', 'both']]
+    param_names = ['megapixels', 'extend']
+    timeout = 300
+
+    def setup(self, megapixels, extend):
+        self.data = _precipitation(megapixels)
+        self.out = np.empty(self.data.shape + (4,), dtype=np.uint8)
+        self.cmap, self.norm = create_level_colormap(
+            _LEVELS, base='ncl_precip_11lev', extend=extend)
+
+    def time_apply_levels(self, megapixels, extend):
+        apply_levels(self.data, _LEVELS, base='ncl_precip_11lev',
+                     extend=extend, out=self.out)
+
+    def time_level_norm(self, megapixels, extend):
+        self.norm(self.data)
+
+
+class TimeBoundaryNorm(object):
+    """Bin and colorize rainfall fields with `BoundaryNorm`, for
+    comparison with `TimeLevels`.
+
+    `BoundaryNorm` allocates several copies of the data, so the largest
+    field is left out.
+
+    """
+
+    params = [[1, 10]]
+    param_names = ['megapixels']
+
+    def setup(self, megapixels):
+        self.data = _precipitation(megapixels)
+        self.cmap, _ = create_level_colormap(_LEVELS,
+                                             base='ncl_precip_11lev')
+        self.norm = BoundaryNorm(_LEVELS, ncolors=len(_LEVELS) - 1)
+
+    def time_boundary_norm(self, megapixels):
+        self.norm(self.data)
+
+    def time_matplotlib(self, megapixels):
+        self.cmap(self.norm(self.data), bytes=True)
+
+
+if __name__ == '__main__':
+    from .common import run
+    run(TimeApply, TimeMatplotlib, TimeApplyThreads, TimeLevels,
+        TimeBoundaryNorm)
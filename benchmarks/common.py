@@ -0,0 +1,66 @@
+"""Minimal runner for asv-style benchmark classes."""
+from __future__ import print_function
+import itertools
+import timeit
+
+
+def _param_sets(cls):
+    params = getattr(cls, 'params', None)
+    if params is None:
+        return [()]
+    if not isinstance(params[0], (list, tuple)):
+        params = [params]
+    return list(itertools.product(*params))
+
+
+def run(*classes, **kwargs):
+    """Run the benchmarks of the given benchmark classes.
+
+    Each ``time_*`` method is timed with `timeit.Timer.autorange` and
+    the best of *repeat* runs (default 3) is reported. Each ``track_*``
+    method is called once and the value it returns is reported. As in
+    asv, a parameter combination whose ``setup`` raises
+    `NotImplementedError` is skipped.
+
+    Returns a list of results, one dictionary per benchmark and
+    parameter combination with the keys 'name', 'params', 'value' and
+    'unit'. Times are in seconds.
+
+    """
+    repeat = kwargs.get('repeat', 3)
+    results = []
+    for cls in classes:
+        names = sorted(name for name in dir(cls)
+                       if name.startswith(('time_', 'track_')))
+        for args in _param_sets(cls):
+            bench = cls()
+            if hasattr(bench, 'setup'):
+                try:
+                    bench.setup(*args)
+                except NotImplementedError:
+                    continue
+            for name in names:
+                method = getattr(bench, name)
+                label = '{}.{}'.format(cls.__name__, name)
+                if args:
+                    label += '({})'.format(', '.join(map(repr, args)))
+                if name.startswith('track_'):
+                    value = method(*args)
+                    unit = getattr(method, 'unit', '')
+                    print('{:<70s} {!r} {}'.format(label, value, unit))
+                else:
+                    timer = timeit.Timer(lambda: method(*args))
+                    number, _ = timer.autorange()
+                    value = min(timer.repeat(repeat=repeat,
+                                             number=number)) / number
+                    unit = 'seconds'
+                    print('{:<70s} {:12.6f} ms'.format(label, 1e3 * value))
+                results.append({'name': '{}.{}.{}'.format(cls.__module__,
+                                                          cls.__name__,
+                                                          name),
+                                'params': list(args),
+                                'value': value,
+                                'unit': unit})
+            if hasattr(bench, 'teardown'):
+                bench.teardown(*args)
+    return results
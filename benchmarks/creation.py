@@ -0,0 +1,176 @@
+"""Benchmarks for creating colormaps from colormap bases."""
+from __future__ import absolute_import
+import timeit
+
+import numpy as np
+
+from colormaps import (ColormapRecipe,
+                       create_colormap,
+                       create_colormaps,
+                       create_colors,
+                       get_colormap_base,
+                       colormap_cache_info,
+                       set_colormap_cache_size,)
+from colormaps.colormaps import _interpolate_colors
+
+
+def _legacy_interpolate(rgb, ncolors):
+    # The original implementation: one numpy.interp call per channel
+    # followed by a transposing copy.
+    x0 = np.arange(0, rgb.shape[0])
+    x1 = np.linspace(0, rgb.shape[0] - 1, ncolors)
+    red = np.interp(x1, x0, rgb[:, 0])
+    green = np.interp(x1, x0, rgb[:, 1])
+    blue = np.interp(x1, x0, rgb[:, 2])
+    return np.array([red, green, blue]).transpose()
+
+
+class TimeInterpolate(object):
+    """Interpolate bases of 5, 11 and 254 colors."""
+
+    params = [['whbk', 'brewer_BrBG_11', 'ncl_amwg256'],
+              [8, 256, 4096, 65536]]
+    param_names = ['base', 'ncolors']
+
+    def setup(self, base, ncolors):
+        self.rgb = get_colormap_base(base).colors
+
+    def time_interpolate(self, base, ncolors):
+        _interpolate_colors(self.rgb, ncolors)
+
+    def time_legacy_interpolate(self, base, ncolors):
+        _legacy_interpolate(self.rgb, ncolors)
+
+
+class TimeCreateColormap(object):
+    """Create a colormap without the cache."""
+
+    params = [[8, 256, 4096, 65536], [False, True], [False, True]]
+    param_names = ['ncolors', 'reverse', 'white']
+
+    def setup(self, ncolors, reverse, white):
+        self.cache_size = colormap_cache_info().maxsize
+        set_colormap_cache_size(0)
+
+    def teardown(self, ncolors, reverse, white):
+        set_colormap_cache_size(self.cache_size)
+
+    def time_create_colormap(self, ncolors, reverse, white):
+        create_colormap(ncolors, base='ncl_amwg256', reverse=reverse,
+                        white=white)
+
+    def time_create_colors(self, ncolors, reverse, white):
+        create_colors(ncolors, base='ncl_amwg256', reverse=reverse,
+                      white=white)
+
+
+class TimeCreateColormapCached(object):
+    """Create a colormap whose colors are already in the cache."""
+
+    params = [[8, 256, 4096, 65536], [False, True], [False, True]]
+    param_names = ['ncolors', 'reverse', 'white']
+
+    def setup(self, ncolors, reverse, white):
+        create_colors(ncolors, base='ncl_amwg256', reverse=reverse,
+                      white=white)
+
+    def time_create_colormap(self, ncolors, reverse, white):
+        create_colormap(ncolors, base='ncl_amwg256', reverse=reverse,
+                        white=white)
+
+
+class TimeInterpolationSpace(object):
+    """Create colors interpolated in each color space, without the cache.
+
+    ``track_relative_time`` is the time relative to interpolating in
+    sRGB, which should stay within a small constant factor.
+
+    """
+
+    params = [['whbk', 'brewer_BrBG_11', 'ncl_amwg256'],
+              [256, 4096, 65536],
+              ['srgb', 'linear_rgb', 'lab']]
+    param_names = ['base', 'ncolors', 'interpolation']
+
+    def setup(self, base, ncolors, interpolation):
+        self.cache_size = colormap_cache_info().maxsize
+        set_colormap_cache_size(0)
+        # Convert the base colors before timing, as that is done once.
+        create_colors(ncolors, base=base, interpolation=interpolation)
+
+    def teardown(self, base, ncolors, interpolation):
+        set_colormap_cache_size(self.cache_size)
+
+    def time_create_colors(self, base, ncolors, interpolation):
+        create_colors(ncolors, base=base, interpolation=interpolation)
+
+    def track_relative_time(self, base, ncolors, interpolation):
+        times = []
+        for space in ('srgb', interpolation):
+            timer = timeit.Timer(lambda: create_colors(
+                ncolors, base=base, interpolation=space))
+            number, _ = timer.autorange()
+            times.append(min(timer.repeat(repeat=3, number=number)) / number)
+        return times[1] / times[0]
+    track_relative_time.unit = 'ratio'
+
+
+class TimeCreateMany(object):
+    """Create colormaps of many lengths from one base."""
+
+    params = [[10, 100, 500]]
+    param_names = ['nlengths']
+
+    def setup(self, nlengths):
+        self.lengths = list(range(8, 8 + 4 * nlengths, 4))
+        # Disable the cache so the loop really creates every colormap.
+        self.cache_size = colormap_cache_info().maxsize
+        set_colormap_cache_size(0)
+
+    def teardown(self, nlengths):
+        set_colormap_cache_size(self.cache_size)
+
+    def time_create_colormaps(self, nlengths):
+        create_colormaps('brewer_BrBG_11', self.lengths, white=True)
+
+    def time_create_colormap_loop(self, nlengths):
+        for ncolors in self.lengths:
+            create_colormap(ncolors, base='brewer_BrBG_11', white=True)
+
+
+class TimeRecipe(object):
+    """Compute the colors of a recipe that reverses, truncates, joins and
+    bands bases, against applying each step to a colormap in turn.
+
+    """
+
+    params = [[256, 4096, 65536]]
+    param_names = ['ncolors']
+
+    def setup(self, ncolors):
+        self.recipe = (ColormapRecipe('brewer_Blues_09').reversed() +
+                       ColormapRecipe('ncl_amwg256').truncate(.2, .8)
+                       ).band(.1)
+        self.cache_size = colormap_cache_info().maxsize
+        set_colormap_cache_size(0)
+
+    def teardown(self, ncolors):
+        set_colormap_cache_size(self.cache_size)
+
+    def time_recipe(self, ncolors):
+        self.recipe.colors(ncolors)
+
+    def time_stepwise(self, ncolors):
+        nband = int(round(.1 * ncolors))
+        nhalf = (ncolors - nband) // 2
+        blues = create_colors(nhalf, base='brewer_Blues_09')[::-1]
+        amwg = create_colors(int(round(nhalf / .6)), base='ncl_amwg256')
+        start = int(round(.2 * len(amwg)))
+        amwg = amwg[start:start + ncolors - nband - nhalf]
+        np.concatenate([blues, np.ones([nband, 3]), amwg])
+
+
+if __name__ == '__main__':
+    from .common import run
+    run(TimeInterpolate, TimeCreateColormap, TimeCreateColormapCached,
+        TimeInterpolationSpace, TimeCreateMany, TimeRecipe)
@@ -0,0 +1,64 @@
+"""Benchmarks for importing the package."""
+from __future__ import absolute_import
+import json
+import os
+import subprocess
+import sys
+
+import colormaps
+
+
+# Run in a fresh interpreter so nothing is already imported. On Linux peak
+# RSS is read from /proc, since the getrusage peak survives exec and so
+# includes the peak of the benchmark process that started the interpreter.
+# Otherwise it is reported by getrusage in bytes (on macOS).
+_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+import colormaps
+elapsed = time.perf_counter() - start
+try:
+    with open('/proc/self/status') as f:
+        rss = [int(line.split()[1]) * 1024 for line in f
+               if line.startswith('VmHWM:')][0]
+except (IOError, IndexError):
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({'time': elapsed, 'rss': rss,
+                  'matplotlib': 'matplotlib' in sys.modules,
+                  'scipy': 'scipy' in sys.modules}))
+"""
+
+
+def _cold_import():
+    env = dict(os.environ)
+    package_root = os.path.dirname(os.path.dirname(colormaps.__file__))
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [package_root, env.get('PYTHONPATH')]))
+    output = subprocess.check_output([sys.executable, '-c', _SCRIPT],
+                                     env=env)
+    return json.loads(output.decode('utf-8'))
+
+
+class TrackImport(object):
+    """Cold ``import colormaps`` in a new interpreter."""
+
+    def track_import_time(self):
+        return _cold_import()['time']
+    track_import_time.unit = 'seconds'
+
+    def track_import_peak_rss(self):
+        return _cold_import()['rss']
+    track_import_peak_rss.unit = 'bytes'
+
+    def track_imports_matplotlib(self):
+        return int(_cold_import()['matplotlib'])
+    track_imports_matplotlib.unit = 'boolean'
+
+    def track_imports_scipy(self):
+        return int(_cold_import()['scipy'])
+    track_imports_scipy.unit = 'boolean'
+
+
+if __name__ == '__main__':
+    from .common import run
+    run(TrackImport)
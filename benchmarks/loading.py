@@ -0,0 +1,61 @@
+"""Benchmarks for discovering and loading palette files."""
+from __future__ import absolute_import
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from colormaps.colormaps import _palette_cache_file, _palette_dir_bases
+
+
+def _make_palette_tree(root, nfiles, ncolors=16, per_dir=250):
+    """Write *nfiles* synthetic palette files into subdirectories."""
+    rng = np.random.RandomState(0)
+    for i in range(nfiles):
+        subdir = os.path.join(root, 'set{:03d}'.format(i // per_dir))
+        if not os.path.isdir(subdir):
+            os.makedirs(subdir)
+        with open(os.path.join(subdir, 'p{:05d}.txt'.format(i)), 'w') as f:
+            f.write('# name: synthetic_{:05d}\n'.format(i))
+            f.write('# description: synthetic palette {:d}\n'.format(i))
+            np.savetxt(f, rng.randint(0, 256, size=(ncolors, 3)), fmt='%d')
+
+
+class TimeLoadPaletteTree(object):
+    """Load a synthetic tree of 5000 palette files."""
+
+    params = [[1, 4, 16]]
+    param_names = ['threads']
+    timeout = 300
+
+    def setup(self, threads):
+        self.tmpdir = tempfile.mkdtemp()
+        self.tree = os.path.join(self.tmpdir, 'palettes')
+        _make_palette_tree(self.tree, 5000)
+        self.xdg_cache_home = os.environ.get('XDG_CACHE_HOME')
+        os.environ['XDG_CACHE_HOME'] = os.path.join(self.tmpdir, 'cache')
+        self.cache_file = _palette_cache_file(self.tree)
+
+    def teardown(self, threads):
+        if self.xdg_cache_home is None:
+            del os.environ['XDG_CACHE_HOME']
+        else:
+            os.environ['XDG_CACHE_HOME'] = self.xdg_cache_home
+        shutil.rmtree(self.tmpdir)
+
+    def time_scan_headers(self, threads):
+        _palette_dir_bases(self.tree, False, {}, None, threads=threads)
+
+    def time_parse_uncached(self, threads):
+        if os.path.exists(self.cache_file):
+            os.remove(self.cache_file)
+        _palette_dir_bases(self.tree, True, {}, None, threads=threads)
+
+    def time_load_cached(self, threads):
+        _palette_dir_bases(self.tree, True, {}, None, threads=threads)
+
+
+if __name__ == '__main__':
+    from .common import run
+    run(TimeLoadPaletteTree)
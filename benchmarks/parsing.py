@@ -0,0 +1,89 @@
+"""Benchmarks for parsing palette files."""
+from __future__ import absolute_import
+import os
+import re
+import timeit
+
+import numpy as np
+
+from colormaps.colormaps import (_PACKAGE_DIR,
+                                 _colormap_file_parser,)
+
+
+def _palette_files(subdir='', recursive=True):
+    root = os.path.join(_PACKAGE_DIR, 'palette', subdir)
+    files = sorted(os.path.join(dirpath, filename)
+                   for dirpath, _, filenames in os.walk(root)
+                   for filename in filenames if filename.endswith('.txt'))
+    if not recursive:
+        files = [filename for filename in files
+                 if os.path.dirname(filename) == root.rstrip(os.sep)]
+    return files
+
+
+def _legacy_parser(filename):
+    # The original file parser: header lines are selected with an
+    # uncompiled regular expression and the file is read a second time by
+    # numpy.loadtxt.
+    with open(filename, 'r') as f:
+        header = filter(lambda line: re.match(r'^\s*#.*:\s+.*$', line),
+                        f.readlines())
+    name = None
+    for line in header:
+        line = line.replace('#', '', 1).split(':')
+        if line[0].strip().lower() == 'name':
+            name = line[1].strip()
+    return name, np.loadtxt(filename)
+
+
+class TimeParsePalettes(object):
+    """Parse every bundled palette file."""
+
+    def setup(self):
+        self.files = _palette_files()
+
+    def time_parser(self):
+        for filename in self.files:
+            _colormap_file_parser(filename)
+
+    def time_legacy_parser(self):
+        for filename in self.files:
+            _legacy_parser(filename)
+
+
+class TimeParseTree(object):
+    """Parse the palette files of each tree, per file.
+
+    The 'palette' tree is the files directly in the palette directory;
+    'ncl' and 'brewer' are its subdirectories.
+
+    """
+
+    params = [['palette', 'ncl', 'brewer']]
+    param_names = ['tree']
+
+    def setup(self, tree):
+        if tree == 'palette':
+            self.files = _palette_files(recursive=False)
+        else:
+            self.files = _palette_files(tree)
+
+    def time_parse_tree(self, tree):
+        for filename in self.files:
+            _colormap_file_parser(filename)
+
+    def track_parse_time_per_file(self, tree):
+        # The best of several passes over the tree, divided by the number
+        # of files.
+        timer = timeit.Timer(lambda: self.time_parse_tree(tree))
+        return min(timer.repeat(repeat=5, number=1)) / len(self.files)
+    track_parse_time_per_file.unit = 'seconds'
+
+    def track_nfiles(self, tree):
+        return len(self.files)
+    track_nfiles.unit = 'files'
+
+
+if __name__ == '__main__':
+    from .common import run
+    run(TimeParsePalettes, TimeParseTree)
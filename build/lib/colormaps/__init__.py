@@ -0,0 +1,78 @@
+"""Colormap generation for matplotlib."""
+# Copyright (c) 2012 Andrew Dawson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+from __future__ import absolute_import
+
+from .colormaps import (create_colormap,
+                        create_colormaps,
+                        create_colors,
+                        create_continuous_colormap,
+                        register_colormap_base,
+                        register_colormap_bases,
+                        colormap_registry_generation,
+                        freeze,
+                        list_colormap_bases,
+                        get_colormap_base_names,
+                        get_colormap_base,
+                        refresh_colormap_bases,
+                        show_colormap,
+                        set_colormap_cache_size,
+                        colormap_cache_info,
+                        clear_colormap_cache,
+                        ColormapBase,)
+from .colorize import apply, apply_chunks
+from .levels import create_level_colormap, apply_levels
+from .recipe import ColormapRecipe
+from .instrument import profiling, profiling_stats, reset_profiling_stats
+from .shared import (share_colormap_bases,
+                     attach_colormap_bases,
+                     release_shared_colormap_bases,)
+
+
+__all__ = ['create_colormap',
+           'create_colormaps',
+           'create_colors',
+           'create_continuous_colormap',
+           'create_level_colormap',
+           'register_colormap_base',
+           'register_colormap_bases',
+           'colormap_registry_generation',
+           'freeze',
+           'list_colormap_bases',
+           'get_colormap_base_names',
+           'get_colormap_base',
+           'refresh_colormap_bases',
+           'show_colormap',
+           'set_colormap_cache_size',
+           'colormap_cache_info',
+           'clear_colormap_cache',
+           'ColormapBase',
+           'ColormapRecipe',
+           'apply',
+           'apply_chunks',
+           'apply_levels',
+           'share_colormap_bases',
+           'attach_colormap_bases',
+           'release_shared_colormap_bases',
+           'profiling',
+           'profiling_stats',
+           'reset_profiling_stats', ]
+
+__version__ = '1.0.x'
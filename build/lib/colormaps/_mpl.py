@@ -0,0 +1,176 @@
+"""Matplotlib colormap and norm classes returned by the package."""
+# Copyright (c) 2012 Andrew Dawson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# This module imports matplotlib, so it is only imported when a colormap
+# or norm is created, to keep matplotlib out of ``import colormaps``.
+from __future__ import absolute_import, division
+
+from matplotlib import colors as mcolors
+import numpy as np
+
+from .colormaps import _REGISTRY, _to_uint8, _unpickle_colormap
+from .levels import _LevelBins
+
+
+class Colormap(mcolors.ListedColormap):
+    """A `ListedColormap` that pickles as the recipe that made it.
+
+    The recipe is the name and content hash of the colormap base and the
+    arguments of `create_colormap`. Unpickling recreates the colormap
+    from the registry of the receiving process, so the colors are not
+    sent. The colormap is pickled normally, with its colors, if the base
+    is no longer registered or the colors have been replaced.
+
+    """
+
+    def __reduce_ex__(self, protocol):
+        recipe = vars(self).get('_recipe')
+        if recipe is not None:
+            base, digest, colors, args = recipe
+            bases, _ = _REGISTRY.snapshot()
+            if (self.colors is colors and bases.get(base.name) is base and
+                    base._content_digest() == digest):
+                state = dict((key, value)
+                             for key, value in vars(self).items()
+                             if key not in ('_recipe', '_lut', '_isinit',
+                                            'colors'))
+                return _unpickle_colormap, ((base.name, digest) + args,
+                                            state)
+        return mcolors.ListedColormap.__reduce_ex__(self, protocol)
+
+    def __getstate__(self):
+        # Only reached when the recipe is out of date, so it is dropped.
+        state = dict(vars(self))
+        state.pop('_recipe', None)
+        return state
+
+
+class ContinuousColormap(mcolors.Colormap):
+    """A matplotlib colormap that evaluates a `ColormapBase`.
+
+    Floating point values are mapped by `ColormapBase.evaluate`, so
+    the colors vary continuously. The lookup table of *ncolors*
+    colors matplotlib keeps is only used for integer values.
+
+    """
+
+    def __init__(self, base, name=None, ncolors=256, reverse=False,
+                 white=0., interpolation='srgb'):
+        mcolors.Colormap.__init__(self, base.name if name is None else name,
+                          ncolors)
+        self.base = base
+        self.reverse = reverse
+        self.white = white
+        self.interpolation = interpolation
+
+    def _evaluate(self, x, out=None):
+        return self.base.evaluate(x, reverse=self.reverse,
+                                  white=self.white, alpha=True,
+                                  interpolation=self.interpolation,
+                                  out=out)
+
+    def _init(self):
+        lut = np.zeros([self.N + 3, 4])
+        self._evaluate(np.linspace(0, 1, self.N), out=lut[:-3])
+        self._lut = lut
+        self._isinit = True
+        try:
+            self._update_lut_extremes()
+        except AttributeError:
+            # Before matplotlib 3.11.
+            self._set_extremes()
+
+    def __call__(self, X, alpha=None, bytes=False):
+        values = np.ma.getdata(X)
+        if np.asarray(values).dtype.kind != 'f':
+            return mcolors.Colormap.__call__(self, X, alpha=alpha, bytes=bytes)
+        values = np.asarray(values)
+        rgba = self._evaluate(values)
+        if alpha is not None:
+            rgba[..., 3] = np.clip(alpha, 0, 1)
+        if self._rgba_under is not None:
+            rgba[values < 0] = self._rgba_under
+        if self._rgba_over is not None:
+            rgba[values > 1] = self._rgba_over
+        bad = np.isnan(values) | np.ma.getmaskarray(X)
+        rgba[bad] = self._rgba_bad
+        if bytes:
+            rgba = _to_uint8(rgba)
+        if not np.iterable(X):
+            rgba = tuple(rgba)
+        return rgba
+
+    def reversed(self, name=None):
+        if name is None:
+            name = self.name + '_r'
+        cmap = self.copy()
+        cmap.name = name
+        cmap.reverse = not self.reverse
+        cmap._isinit = False
+        return cmap
+
+    def resampled(self, lutsize):
+        # A new instance, so that the lookup table indices matplotlib
+        # derives from N are recomputed, keeping the extreme colors
+        # as matplotlib's own colormaps do.
+        cmap = type(self)(self.base, name=self.name, ncolors=lutsize,
+                          reverse=self.reverse, white=self.white,
+                          interpolation=self.interpolation)
+        cmap._rgba_over = self._rgba_over
+        cmap._rgba_under = self._rgba_under
+        cmap._rgba_bad = self._rgba_bad
+        cmap.colorbar_extend = self.colorbar_extend
+        return cmap
+
+
+class LevelNorm(mcolors.BoundaryNorm):
+    """A `BoundaryNorm` with one color per level bin that bins values
+    with an integer lookup table and `numpy.searchsorted`.
+
+    It gives the same bins as `BoundaryNorm`, but works through the
+    data in blocks without floating point copies of the whole array.
+    NaN values are masked, so they are given the bad color.
+
+    """
+
+    def __call__(self, value, clip=None):
+        if clip is None:
+            clip = self.clip
+        data = np.ma.getdata(value)
+        is_scalar = np.ndim(data) == 0
+        data = np.asarray(data)
+        if data.dtype.kind not in 'iuf':
+            data = data.astype(np.float64)
+        values = data.reshape(-1)
+        indices = np.empty(values.size, dtype=np.intp)
+        _LevelBins(np.asarray(self.boundaries, dtype=np.float64)
+                   ).blocks(values, indices)
+        indices -= 1
+        if clip:
+            np.clip(indices, 0, self.Ncmap - 1, out=indices)
+        mask = np.ma.getmaskarray(value).reshape(-1)
+        if values.dtype.kind == 'f':
+            mask |= np.isnan(values)
+        result = np.ma.array(indices.reshape(data.shape),
+                             mask=mask.reshape(data.shape))
+        if is_scalar:
+            return np.ma.masked if mask[0] else int(indices[0])
+        return result
@@ -0,0 +1,178 @@
+"""Reading and writing of binary palette bundles."""
+# Copyright (c) 2012 Andrew Dawson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# A bundle is a single file laid out as:
+#
+#   magic (8 bytes) | version (uint32) | index length (uint32)
+#   JSON index, padded with spaces to a multiple of 8 bytes
+#   little-endian float64 color matrix of shape (nrows, 3)
+#
+# The index lists every base with its meta-data and the rows of the color
+# matrix it occupies, so the matrix can be memory-mapped in one go.
+from __future__ import absolute_import
+import json
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+
+_MAGIC = b'CMAPBNDL'
+_VERSION = 1
+_PREAMBLE = struct.Struct('<8sII')
+_DTYPE = np.dtype('<f8')
+
+
+def pack_bundle(records):
+    """Pack records into the parts of a bundle.
+
+    Returns the bundle header (the preamble and padded index) as bytes
+    and the color matrix as a C-contiguous array. A bundle is the header
+    immediately followed by the bytes of the matrix.
+
+    **Argument:**
+
+    *records*
+        An iterable of dictionaries, each with the keys 'name',
+        'description', 'attributes' and 'colors' (an (N, 3) array),
+        plus any other JSON serializable keys that should be stored in
+        the index alongside them.
+
+    """
+    entries = []
+    blocks = []
+    nrows = 0
+    for record in records:
+        colors = np.asarray(record['colors'], dtype=_DTYPE)
+        entry = dict((key, value) for key, value in record.items()
+                     if key != 'colors')
+        entry['offset'] = nrows
+        entry['ncolors'] = colors.shape[0]
+        entries.append(entry)
+        blocks.append(colors)
+        nrows += colors.shape[0]
+    index = json.dumps({'nrows': nrows, 'bases': entries}).encode('utf-8')
+    index += b' ' * (-(_PREAMBLE.size + len(index)) % 8)
+    header = _PREAMBLE.pack(_MAGIC, _VERSION, len(index)) + index
+    if blocks:
+        matrix = np.concatenate(blocks)
+    else:
+        matrix = np.empty([0, 3], dtype=_DTYPE)
+    return header, matrix
+
+
+def write_bundle(filename, records):
+    """Write a palette bundle.
+
+    **Arguments:**
+
+    *filename*
+        Name of the bundle file to write. The file is written to a
+        temporary file first and then moved into place, so readers
+        never see a partially written bundle.
+
+    *records*
+        As for `pack_bundle`.
+
+    """
+    header, matrix = pack_bundle(records)
+    dirname = os.path.dirname(os.path.abspath(filename))
+    fd, tmpname = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            f.write(matrix.tobytes())
+        # mkstemp creates files only readable by their owner.
+        os.chmod(tmpname, 0o644)
+        os.replace(tmpname, filename)
+    except BaseException:
+        try:
+            os.remove(tmpname)
+        except OSError:
+            pass
+        raise
+
+
+def _unpack_preamble(preamble, filename):
+    try:
+        magic, version, index_length = _PREAMBLE.unpack(preamble)
+    except struct.error:
+        magic = version = None
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError('not a palette bundle: {!s}'.format(filename))
+    return index_length
+
+
+def read_bundle(filename):
+    """Read a palette bundle.
+
+    Returns a list of index entries (dictionaries) and the color matrix
+    as a read-only memory-mapped array. The colors for an entry are the
+    rows ``offset:offset + ncolors`` of the matrix.
+
+    **Argument:**
+
+    *filename*
+        Name of the bundle file to read.
+
+    """
+    with open(filename, 'rb') as f:
+        index_length = _unpack_preamble(f.read(_PREAMBLE.size), filename)
+        index = json.loads(f.read(index_length).decode('utf-8'))
+    nrows = index['nrows']
+    if nrows:
+        data = np.memmap(filename, dtype=_DTYPE, mode='r',
+                         offset=_PREAMBLE.size + index_length,
+                         shape=(nrows, 3))
+    else:
+        data = np.empty([0, 3], dtype=_DTYPE)
+    return index['bases'], data
+
+
+def unpack_bundle(buffer):
+    """Read a palette bundle held in memory.
+
+    Returns a list of index entries and the color matrix, as for
+    `read_bundle`. The matrix is a read-only view of *buffer*, so
+    *buffer* must stay open for as long as the matrix is used.
+
+    **Argument:**
+
+    *buffer*
+        An object supporting the buffer protocol (e.g. the `buf` of a
+        `multiprocessing.shared_memory.SharedMemory`) that starts with
+        a bundle.
+
+    """
+    buffer = memoryview(buffer).cast('B')
+    index_length = _unpack_preamble(bytes(buffer[:_PREAMBLE.size]),
+                                    '<buffer>')
+    offset = _PREAMBLE.size + index_length
+    index = json.loads(bytes(buffer[_PREAMBLE.size:offset]).decode('utf-8'))
+    nrows = index['nrows']
+    if nrows:
+        data = np.frombuffer(buffer, dtype=_DTYPE, count=nrows * 3,
+                             offset=offset).reshape(nrows, 3)
+        data.flags.writeable = False
+    else:
+        data = np.empty([0, 3], dtype=_DTYPE)
+    return index['bases'], data
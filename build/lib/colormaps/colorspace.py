@@ -0,0 +1,130 @@
+"""Conversion of colors between sRGB and the spaces used to interpolate."""
+# Copyright (c) 2012 Andrew Dawson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# All conversions work on whole (N, 3) arrays at once. sRGB values are
+# assumed to use the D65 white point, and CIELAB is relative to D65.
+from __future__ import absolute_import, division
+
+import numpy as np
+
+
+# The color spaces colormaps can be interpolated in.
+SPACES = ('srgb', 'linear_rgb', 'lab')
+
+# Linear RGB to CIE XYZ, and back.
+_RGB_TO_XYZ = np.array([[0.4124564, 0.3575761, 0.1804375],
+                        [0.2126729, 0.7151522, 0.0721750],
+                        [0.0193339, 0.1191920, 0.9503041]])
+_XYZ_TO_RGB = np.linalg.inv(_RGB_TO_XYZ)
+
+# The D65 reference white in CIE XYZ.
+_WHITE = np.array([0.95047, 1., 1.08883])
+
+# The same transforms applied to rows of linear RGB and of XYZ relative to
+# the white point, which is what CIELAB is defined in terms of.
+_RGB_TO_XYZN = (_RGB_TO_XYZ / _WHITE[:, np.newaxis]).T
+_XYZN_TO_RGB = (_XYZ_TO_RGB * _WHITE).T
+
+# Constants of the CIELAB transfer function.
+_DELTA = 6. / 29.
+
+# CIELAB is linear in the transformed XYZ values f: L = 116 fY - 16,
+# a = 500 (fX - fY) and b = 200 (fY - fZ). These map rows of f to rows of
+# (L + 16, a, b), and back.
+_F_TO_LAB = np.array([[0., 500., 0.],
+                      [116., -500., 200.],
+                      [0., 0., -200.]])
+_LAB_TO_F = np.linalg.inv(_F_TO_LAB)
+
+
+def check_space(space):
+    """Raise `ValueError` if *space* is not one of `SPACES`."""
+    if space not in SPACES:
+        raise ValueError('interpolation must be one of {!s}: '
+                         '{!r}'.format(', '.join(SPACES), space))
+
+
+def from_srgb(rgb, space):
+    """Convert an (N, 3) array of sRGB colors in the range 0 to 1 to
+    *space*. A new array is always returned.
+
+    """
+    if space == 'srgb':
+        return np.array(rgb, dtype=np.float64)
+    linear = _decode(rgb)
+    if space == 'linear_rgb':
+        return linear
+    return _xyzn_to_lab(linear.dot(_RGB_TO_XYZN))
+
+
+def to_srgb(values, space):
+    """Convert an (N, 3) array of colors in *space* to sRGB, clipped to
+    the range 0 to 1 unless *space* is 'srgb', in which case *values* is
+    returned unchanged. *values* may be overwritten.
+
+    """
+    if space == 'srgb':
+        return values
+    if space == 'lab':
+        values = _lab_to_xyzn(values).dot(_XYZN_TO_RGB)
+    np.clip(values, 0., 1., out=values)
+    return np.clip(_encode(values), 0., 1., out=values)
+
+
+def _decode(rgb):
+    """Return the linear light values of sRGB values."""
+    rgb = np.asarray(rgb, dtype=np.float64)
+    # Both branches are computed for every value and the results merged,
+    # which is much faster than indexing with the mask.
+    linear = rgb + 0.055
+    linear /= 1.055
+    linear **= 2.4
+    np.copyto(linear, rgb / 12.92, where=rgb <= 0.04045)
+    return linear
+
+
+def _encode(linear):
+    """Return the sRGB values of linear light values, in place."""
+    straight = linear <= 0.0031308
+    scaled = linear * 12.92
+    linear **= 1. / 2.4
+    linear *= 1.055
+    linear -= 0.055
+    np.copyto(linear, scaled, where=straight)
+    return linear
+
+
+def _xyzn_to_lab(xyz):
+    f = np.cbrt(xyz)
+    np.copyto(f, xyz / (3 * _DELTA ** 2) + 4. / 29.,
+              where=xyz <= _DELTA ** 3)
+    lab = f.dot(_F_TO_LAB)
+    lab[:, 0] -= 16.
+    return lab
+
+
+def _lab_to_xyzn(lab):
+    f = lab.dot(_LAB_TO_F)
+    f += 16. / 116.
+    xyz = f * f
+    xyz *= f
+    np.copyto(xyz, 3 * _DELTA ** 2 * (f - 4. / 29.), where=f <= _DELTA)
+    return xyz
@@ -0,0 +1,171 @@
+"""Opt-in timing and counting of the work done by the package."""
+# Copyright (c) 2012 Andrew Dawson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# Functions decorated with `timed` check one module-level flag per call and
+# do nothing else unless instrumentation is enabled, either for the whole
+# process by the COLORMAPS_PROFILE environment variable or for the
+# duration of a `profiling` block.
+from __future__ import absolute_import, print_function
+import atexit
+from contextlib import contextmanager
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+
+_ENABLED = False
+_DEPTH = 0
+_LOCK = threading.Lock()
+_TIMERS = {}
+_COUNTERS = {}
+_FILES = {}
+
+
+def timed(name, per_file=False):
+    """Decorate a function to record its calls and time under *name*.
+
+    If *per_file* is *True* the time is also recorded against the first
+    argument of the function, which must be a file name.
+
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with _LOCK:
+                    timer = _TIMERS.setdefault(name, [0, 0.])
+                    timer[0] += 1
+                    timer[1] += elapsed
+                    if per_file:
+                        files = _FILES.setdefault(name, {})
+                        files[args[0]] = files.get(args[0], 0.) + elapsed
+        return wrapper
+    return decorator
+
+
+def count(name):
+    """Increment the counter *name* if instrumentation is enabled."""
+    if _ENABLED:
+        with _LOCK:
+            _COUNTERS[name] = _COUNTERS.get(name, 0) + 1
+
+
+@contextmanager
+def profiling():
+    """Record timings and counts within a ``with`` block.
+
+    Statistics accumulate across blocks (and with those recorded because
+    of COLORMAPS_PROFILE) until `reset_profiling_stats` is called.
+    Blocks may be nested, and recording continues until the outermost
+    block exits.
+
+    For example::
+
+        with colormaps.profiling():
+            cmap = colormaps.create_colormap(11, base='ncl_amwg256')
+        print(colormaps.profiling_stats())
+
+    """
+    global _ENABLED, _DEPTH
+    with _LOCK:
+        _DEPTH += 1
+        _ENABLED = True
+    try:
+        yield
+    finally:
+        with _LOCK:
+            _DEPTH -= 1
+            _ENABLED = _DEPTH > 0
+
+
+def profiling_stats():
+    """Return the statistics recorded so far as a dictionary.
+
+    The dictionary has three entries:
+
+    'timers'
+        Maps the name of each instrumented operation to a dictionary of
+        its number of 'calls', the 'total' time taken and the 'mean'
+        time per call, in seconds. The operations are
+        'find_palette_files', 'scan_palette_header',
+        'parse_palette_file', 'load_colormap_bases' and
+        'create_colormap'.
+
+    'counters'
+        Maps the name of each counter to its count: 'interpolated' and
+        'copied' count the colormaps whose colors were interpolated from
+        their base or copied from it unchanged because the lengths
+        matched.
+
+    'files'
+        Maps 'scan_palette_header' and 'parse_palette_file' to
+        dictionaries of the total time spent on each palette file.
+
+    """
+    with _LOCK:
+        timers = dict((name, {'calls': calls,
+                              'total': total,
+                              'mean': total / calls})
+                      for name, (calls, total) in _TIMERS.items())
+        return {'timers': timers,
+                'counters': dict(_COUNTERS),
+                'files': dict((name, dict(files))
+                              for name, files in _FILES.items())}
+
+
+def reset_profiling_stats():
+    """Discard the statistics recorded so far."""
+    with _LOCK:
+        _TIMERS.clear()
+        _COUNTERS.clear()
+        _FILES.clear()
+
+
+def _dump_stats(destination):
+    stats = json.dumps(profiling_stats(), indent=1, sort_keys=True)
+    if destination == '1':
+        print(stats, file=sys.stderr)
+    else:
+        with open(destination, 'w') as f:
+            f.write(stats)
+
+
+def _profile_from_environment():
+    # COLORMAPS_PROFILE=1 writes the statistics to stderr when the process
+    # exits, any other value is taken as a file name to write them to.
+    global _ENABLED, _DEPTH
+    destination = os.environ.get('COLORMAPS_PROFILE')
+    if destination and destination != '0':
+        _DEPTH += 1
+        _ENABLED = True
+        atexit.register(_dump_stats, destination)
+
+
+_profile_from_environment()
@@ -0,0 +1,289 @@
+"""Colormaps for data contoured at discrete levels."""
+# Copyright (c) 2012 Andrew Dawson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# A value v falls in level bin i when levels[i] <= v < levels[i + 1], as
+# for `matplotlib.colors.BoundaryNorm`, which is the index
+# np.searchsorted(levels, v, side='right') minus one. A binary search per
+# value is slow on large arrays, because its branches are unpredictable,
+# so values are first scaled to one of many equal width buckets spanning
+# the levels, and an integer lookup table gives the searchsorted index
+# for every bucket not within one bucket of a level. Only the values in
+# the remaining buckets, a small fraction of most data, are searched.
+# The colors are then looked up with the index in a table whose first
+# and last rows are the under and over colors.
+from __future__ import absolute_import, division
+import os
+
+import numpy as np
+
+from .colorize import _CHUNKSIZE, _Colorizer, _check_out
+from .colormaps import _colormap_rgb, _to_uint8
+
+
+_EXTENDS = ('neither', 'min', 'max', 'both')
+
+
+def _check_levels(levels):
+    levels = np.array(levels, dtype=np.float64).reshape(-1)
+    if levels.size < 2:
+        raise ValueError('at least two levels are required')
+    if not np.isfinite(levels).all() or (np.diff(levels) <= 0).any():
+        raise ValueError('levels must be finite and strictly increasing')
+    levels.flags.writeable = False
+    return levels
+
+
+def _level_colors(levels, base, extend, reverse, white, interpolation):
+    """Return the colors for *levels*, with one extra color at each end
+    of the colormap that is extended.
+
+    """
+    if extend not in _EXTENDS:
+        raise ValueError('extend must be one of {!s}'.format(
+            ', '.join(repr(name) for name in _EXTENDS)))
+    ncolors = (len(levels) - 1 + (extend in ('min', 'both')) +
+               (extend in ('max', 'both')))
+    return _colormap_rgb(ncolors, base, reverse, white, interpolation)
+
+
+def _level_lut(rgb, extend):
+    """Return an RGBA uint8 table indexed by searchsorted position.
+
+    Row 0 is the under color and the last row the over color; ends that
+    are not extended are transparent, as in matplotlib.
+
+    """
+    lut = np.zeros([len(rgb) + 2 - (extend in ('min', 'both')) -
+                    (extend in ('max', 'both')), 4], dtype=np.uint8)
+    start = 0 if extend in ('min', 'both') else 1
+    lut[start:start + len(rgb), :3] = _to_uint8(rgb)
+    lut[start:start + len(rgb), 3] = 255
+    return lut
+
+
+# Minimum number of buckets in a `_LevelBins` lookup table.
+_NBUCKETS = 4096
+
+
+class _LevelBins(object):
+    """Find the searchsorted indices of values in *levels*."""
+
+    def __init__(self, levels):
+        self.levels = levels
+        nbuckets = max(_NBUCKETS, 64 * len(levels))
+        span = levels[-1] - levels[0]
+        self.scale = nbuckets / span
+        # Buckets 0 and nbuckets + 3 hold all values well below and
+        # above the levels, so positions are offset by two buckets.
+        self.offset = 2. - levels[0] * self.scale
+        self.top = nbuckets + 3.
+        if span < 1e-9 * np.abs(levels).max():
+            # The positions would be too inexact, so search every value.
+            self.lut = None
+            return
+        # Bucket k holds the values from edges[k + 1] to edges[k + 2].
+        edges = np.full(nbuckets + 7, np.inf)
+        edges[:2] = -np.inf
+        edges[2:-2] = levels[0] + (np.arange(nbuckets + 3) - 1.) / self.scale
+        # Positions are accurate to much less than a bucket, so a value
+        # put in bucket k lies between edges[k] and edges[k + 3]. Its
+        # index is the number of levels at or below edges[k] unless a
+        # level lies in between, in which case the bucket is marked with
+        # -1 to search its values.
+        lut = levels.searchsorted(edges[:-3], side='right')
+        lut[lut != levels.searchsorted(edges[3:], side='left')] = -1
+        self.lut = lut
+
+    @staticmethod
+    def scratch(size):
+        return np.empty(size, dtype=np.float64), np.empty(size, dtype=np.intp)
+
+    def __call__(self, values, out, scratch):
+        """Write the indices of the flat array *values* into the intp
+        array *out*, using *scratch* from `scratch` as work arrays.
+
+        """
+        size = values.size
+        if self.lut is None:
+            # Compare in float64 so that values are binned as matplotlib
+            # does.
+            out[...] = self.levels.searchsorted(
+                values.astype(np.float64, copy=False), side='right')
+            return
+        positions = scratch[0][:size]
+        buckets = scratch[1][:size]
+        with np.errstate(over='ignore', invalid='ignore'):
+            np.multiply(values, self.scale, out=positions, dtype=np.float64,
+                        casting='unsafe')
+            positions += self.offset
+        # Unlike np.clip, np.fmax maps NaN values to bucket 0. They are
+        # given the bad color afterwards.
+        np.fmax(positions, 0., out=positions)
+        np.fmin(positions, self.top, out=positions)
+        np.copyto(buckets, positions, casting='unsafe')
+        self.lut.take(buckets, out=out)
+        search = np.flatnonzero(out < 0)
+        if search.size:
+            out[search] = self.levels.searchsorted(
+                values[search].astype(np.float64), side='right')
+
+    def blocks(self, values, out):
+        """Write the indices of the flat array *values* into *out* a
+        block at a time.
+
+        """
+        scratch = self.scratch(min(values.size, _CHUNKSIZE))
+        for start in range(0, values.size, _CHUNKSIZE):
+            self(values[start:start + _CHUNKSIZE],
+                 out[start:start + _CHUNKSIZE], scratch)
+
+
+class _LevelColorizer(_Colorizer):
+    """Map data values to RGBA colors by the level bin they fall in."""
+
+    def __init__(self, levels, lut, bad=(0., 0., 0., 0.)):
+        _Colorizer.__init__(self, lut, levels[0], levels[-1], bad=bad)
+        self.bins = _LevelBins(levels)
+
+    @staticmethod
+    def scratch(size):
+        return _LevelBins.scratch(size) + (np.empty(size, dtype=np.intp),)
+
+    def __call__(self, data, out, scratch=None):
+        values = np.ma.getdata(data).reshape(-1)
+        size = values.size
+        if scratch is None:
+            scratch = self.scratch(size)
+        indices = scratch[2][:size]
+        self.bins(values, indices, scratch)
+        bad = np.isnan(values) if values.dtype.kind in 'fc' else None
+        mask = np.ma.getmask(data)
+        if mask is not np.ma.nomask:
+            bad = mask.reshape(-1) if bad is None else bad | mask.reshape(-1)
+        if bad is not None:
+            indices[bad] = self.ncolors
+        self.table.take(indices, axis=0, out=out.reshape(-1, 4))
+
+
+def create_level_colormap(levels,
+                          base='rainbow',
+                          name=None,
+                          extend='neither',
+                          reverse=False,
+                          white=False,
+                          interpolation='srgb'):
+    """Create a colormap and matching norm for data at discrete levels.
+
+    Returns a (*cmap*, *norm*) pair, as
+    `matplotlib.colors.from_levels_and_colors` does, with one color of
+    the colormap for each interval between consecutive levels. The norm
+    is a `matplotlib.colors.BoundaryNorm` that bins values in blocks
+    with an integer lookup table, falling back to `numpy.searchsorted`
+    only for values close to a level, which is about twice as fast as
+    `BoundaryNorm` on large arrays and needs far less memory. Use
+    `apply_levels` to map data straight to 8-bit RGBA colors.
+
+    **Argument:**
+
+    *levels*
+        The boundaries of the intervals, in strictly increasing order. A
+        value *v* is in interval *i* when
+        ``levels[i] <= v < levels[i + 1]``.
+
+    **Keyword arguments:**
+
+    *base*, *reverse*, *white*, *interpolation*
+        Define the colors, as for `create_colormap`.
+
+    *name*
+        Name for the new colormap.
+
+    *extend*
+        Which ends of the colormap are extended with colors for values
+        below the first level and above the last, as for
+        `matplotlib.axes.Axes.contourf`: 'neither' (the default), 'min',
+        'max' or 'both'. The extra colors are taken from the ends of the
+        colormap. Values beyond an end that is not extended are
+        transparent.
+
+    """
+    from matplotlib.colors import from_levels_and_colors
+    levels = _check_levels(levels)
+    rgb = _level_colors(levels, base, extend, reverse, white,
+                        interpolation)
+    cmap, _ = from_levels_and_colors(levels, rgb, extend=extend)
+    if name is not None:
+        cmap.name = name
+    from ._mpl import LevelNorm
+    norm = LevelNorm(levels, ncolors=len(levels) - 1)
+    return cmap, norm
+
+
+def apply_levels(data,
+                 levels,
+                 base='rainbow',
+                 extend='neither',
+                 reverse=False,
+                 white=False,
+                 interpolation='srgb',
+                 bad=(0., 0., 0., 0.),
+                 out=None,
+                 chunksize=_CHUNKSIZE,
+                 threads=1):
+    """Map data values to the 8-bit RGBA colors of their level intervals.
+
+    The result is the same as calling the colormap returned by
+    `create_level_colormap` on the output of its norm with
+    ``bytes=True``, but the level and color of each value are found
+    with integer lookup tables a block of values at a time, so no
+    temporaries the size of *data* are allocated.
+
+    Returns a uint8 array with the shape of *data* plus a trailing
+    dimension of length 4.
+
+    **Arguments:**
+
+    *data*
+        An array of data values. Masked and NaN values are given the
+        *bad* color.
+
+    *levels*
+        The boundaries of the intervals, as for `create_level_colormap`.
+
+    **Keyword arguments:**
+
+    *base*, *extend*, *reverse*, *white*, *interpolation*
+        As for `create_level_colormap`.
+
+    *bad*, *out*, *chunksize*, *threads*
+        As for `apply`.
+
+    """
+    data = np.asanyarray(data)
+    levels = _check_levels(levels)
+    rgb = _level_colors(levels, base, extend, reverse, white,
+                        interpolation)
+    out = _check_out(out, data.shape)
+    colorizer = _LevelColorizer(levels, _level_lut(rgb, extend), bad=bad)
+    if threads is None:
+        threads = os.cpu_count() or 1
+    colorizer.blocks(data, out, chunksize=chunksize, threads=threads)
+    return out
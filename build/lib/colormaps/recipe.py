@@ -0,0 +1,336 @@
+"""Colormaps composed from transformed colormap bases."""
+# Copyright (c) 2012 Andrew Dawson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# A recipe is an immutable sequence of segments laid end to end along the
+# colormap. Each segment is a (width, base, start, stop, color) tuple: a
+# segment of a base runs from the fractional position *start* to *stop*
+# along the colors of the base named *base* (so *stop* < *start* for a
+# reversed segment) and has *color* None, while a band of one color has
+# *base* None and *color* an RGB tuple. The widths always add up to 1.
+# Operations only build new segment tuples, and the colors are computed
+# from all of the segments at once when they are requested.
+from __future__ import absolute_import, division
+
+import numpy as np
+
+from .colormaps import (_CACHE,
+                        _REGISTRY,
+                        _blend,
+                        _load_base,
+                        ColormapBase,)
+from .colorspace import check_space, from_srgb, to_srgb
+
+
+class ColormapRecipe(object):
+    """A colormap composed from colormap bases by a chain of operations.
+
+    Recipes are immutable: `reversed`, `truncate`, `band` and `concat`
+    (also available as ``+``) return new recipes, and no colors are
+    computed until `colors` or `colormap` is called. The colors for
+    every part of the colormap are then computed together, with a single
+    output array. Recipes are hashable and compare equal when they
+    describe the same colormap, so they can be used as dictionary keys,
+    and the colors they produce are cached like those of
+    `create_colormap`.
+
+    For example, a diverging colormap with a grey band in the middle::
+
+        recipe = (ColormapRecipe('brewer_Blues_09').reversed() +
+                  ColormapRecipe('brewer_Reds_09')).band(0.1, (.8, .8, .8))
+        cmap = recipe.colormap(64)
+
+    """
+
+    __slots__ = ('segments',)
+
+    def __init__(self, base):
+        """Create a recipe for the whole of one colormap base.
+
+        **Argument:**
+
+        *base*
+            The name of a registered colormap base, or a registered
+            `ColormapBase`.
+
+        """
+        if isinstance(base, ColormapBase):
+            base = base.name
+        if base not in _REGISTRY:
+            raise ValueError('colormap base does not exist: '
+                             '{!s}'.format(base))
+        self.segments = ((1., base, 0., 1., None),)
+
+    @classmethod
+    def _from_segments(cls, segments):
+        total = sum(segment[0] for segment in segments)
+        if not total > 0:
+            raise ValueError('a colormap recipe must have a part of '
+                             'non-zero width')
+        recipe = cls.__new__(cls)
+        recipe.segments = tuple((segment[0] / total,) + segment[1:]
+                                for segment in segments if segment[0] > 0)
+        return recipe
+
+    def __eq__(self, other):
+        if not isinstance(other, ColormapRecipe):
+            return NotImplemented
+        return self.segments == other.segments
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(self.segments)
+
+    def __repr__(self):
+        return 'ColormapRecipe({!r})'.format(self.segments)
+
+    def __reduce__(self):
+        return ColormapRecipe._from_segments, (self.segments,)
+
+    def __add__(self, other):
+        return self.concat(other)
+
+    @property
+    def base_names(self):
+        """The names of the colormap bases the recipe uses."""
+        return frozenset(segment[1] for segment in self.segments
+                         if segment[1] is not None)
+
+    def reversed(self):
+        """Return the recipe with the colors in the reverse order."""
+        return self._from_segments([(width, base, stop, start, color)
+                                    for width, base, start, stop, color
+                                    in reversed(self.segments)])
+
+    def truncate(self, start, stop):
+        """Return the part of the colormap between two positions.
+
+        **Arguments:**
+
+        *start*, *stop*
+            The fractional positions along the colormap, with
+            0 <= *start* < *stop* <= 1, of the part to keep.
+
+        """
+        if not 0 <= start < stop <= 1:
+            raise ValueError('start and stop must satisfy '
+                             '0 <= start < stop <= 1')
+        return self._from_segments(self._split(start, stop))
+
+    def band(self, width, color=(1., 1., 1.), at=.5):
+        """Return the colormap with a band of one color inserted.
+
+        The rest of the colormap is squeezed to make room for the band.
+
+        **Argument:**
+
+        *width*
+            The width of the band as a fraction of the new colormap,
+            at least 0 and less than 1.
+
+        **Keyword arguments:**
+
+        *color*
+            The RGB color of the band, with values in the range 0 to 1.
+            Defaults to white.
+
+        *at*
+            The fractional position along the colormap at which the band
+            is inserted. Defaults to 0.5, the centre.
+
+        """
+        if not 0 <= width < 1:
+            raise ValueError('width must be at least 0 and less than 1')
+        if not 0 <= at <= 1:
+            raise ValueError('at must be between 0 and 1')
+        color = tuple(float(value) for value in color)
+        if len(color) != 3:
+            raise ValueError('color must be an RGB tuple')
+        scale = 1. - width
+        segments = [(segment[0] * scale,) + segment[1:]
+                    for segment in self._split(0., at)]
+        segments.append((width, None, 0., 0., color))
+        segments.extend((segment[0] * scale,) + segment[1:]
+                        for segment in self._split(at, 1.))
+        return self._from_segments(segments)
+
+    def concat(self, *others, **kwargs):
+        """Return the colormap followed by other colormaps.
+
+        **Arguments:**
+
+        *others*
+            Recipes to append, in order.
+
+        **Keyword argument:**
+
+        *weights*
+            The relative widths of this colormap and each of *others*.
+            By default they are all the same width.
+
+        """
+        recipes = (self,) + others
+        weights = kwargs.pop('weights', None)
+        if kwargs:
+            raise TypeError('unexpected keyword arguments: '
+                            '{!s}'.format(', '.join(kwargs)))
+        if weights is None:
+            weights = [1.] * len(recipes)
+        if len(weights) != len(recipes) or min(weights) < 0:
+            raise ValueError('weights must be one non-negative number for '
+                             'each colormap')
+        if not sum(weights) > 0:
+            raise ValueError('weights must not all be zero')
+        return self._from_segments([(segment[0] * weight,) + segment[1:]
+                                    for recipe, weight in zip(recipes,
+                                                              weights)
+                                    for segment in recipe.segments])
+
+    def _split(self, start, stop):
+        """Return the segments covering positions *start* to *stop*,
+        cut at those positions.
+
+        """
+        segments = []
+        end = 0.
+        for width, base, first, last, color in self.segments:
+            begin, end = end, end + width
+            low = max(begin, start)
+            high = min(end, stop)
+            if high <= low:
+                continue
+            if base is not None:
+                step = (last - first) / width
+                first, last = (first + (low - begin) * step,
+                               first + (high - begin) * step)
+            segments.append((high - low, base, first, last, color))
+        return segments
+
+    def colors(self, ncolors, interpolation='srgb'):
+        """Return the colors of the colormap.
+
+        Returns a read-only (*ncolors*, 3) array of RGB values in the
+        range 0 to 1. Color *i* is taken from the fractional position
+        ``i / (ncolors - 1)`` along the colormap, interpolating the base
+        colors linearly as `ColormapBase.evaluate` does.
+
+        **Argument:**
+
+        *ncolors*
+            The number of colors required.
+
+        **Keyword argument:**
+
+        *interpolation*
+            The color space to interpolate in, as for `create_colormap`.
+            Defaults to 'srgb'.
+
+        """
+        check_space(interpolation)
+        bases, generation = _REGISTRY.snapshot()
+        key = (self, ncolors, interpolation, generation)
+        try:
+            return _CACHE[key]
+        except KeyError:
+            pass
+        try:
+            bases = dict((name, _load_base(bases[name]))
+                         for name in self.base_names)
+        except KeyError as error:
+            raise ValueError('colormap base does not exist: '
+                             '{!s}'.format(error.args[0]))
+        rgb = self._compute(bases, ncolors, interpolation)
+        rgb.flags.writeable = False
+        _CACHE[key] = rgb
+        return rgb
+
+    def _compute(self, bases, ncolors, interpolation):
+        # Stack the colors of every base and band into one table, so that
+        # all of the output colors are blended from it in a single pass.
+        # Each segment covers the rows offset to limit + 1 of the table.
+        tables = []
+        offsets = {}
+        nrows = 0
+        segment_offsets = []
+        segment_lengths = []
+        for width, base, start, stop, color in self.segments:
+            key = base if color is None else color
+            if key not in offsets:
+                if color is None:
+                    values = bases[base]._colors_in(interpolation)
+                else:
+                    values = from_srgb(np.array([color]), interpolation)
+                offsets[key] = nrows
+                tables.append(values)
+                nrows += len(values)
+            segment_offsets.append(offsets[key])
+            segment_lengths.append(1 if color is not None else
+                                   bases[base].ncolors)
+        # A final row so that the step from the last row is defined.
+        tables.append(tables[-1][-1:])
+        table = np.concatenate(tables)
+        widths = np.array([segment[0] for segment in self.segments])
+        starts = np.array([segment[2] for segment in self.segments])
+        stops = np.array([segment[3] for segment in self.segments])
+        offsets = np.array(segment_offsets, dtype=np.intp)
+        lengths = np.array(segment_lengths, dtype=np.intp)
+        ends = np.cumsum(widths)
+        # The segment each color falls in, and its position within it.
+        positions = np.linspace(0., 1., ncolors)
+        index = np.searchsorted(ends[:-1], positions, side='right')
+        positions -= ends.take(index) - widths.take(index)
+        positions /= widths.take(index)
+        np.clip(positions, 0., 1., out=positions)
+        # Convert to fractional rows of the table.
+        positions *= stops.take(index) - starts.take(index)
+        positions += starts.take(index)
+        positions *= lengths.take(index) - 1
+        lower = positions.astype(np.intp)
+        np.minimum(lower, np.maximum(lengths.take(index) - 2, 0),
+                   out=lower)
+        positions -= lower
+        lower += offsets.take(index)
+        result = np.empty([ncolors, 3])
+        _blend(table, lower, positions, result)
+        return to_srgb(result, interpolation)
+
+    def colormap(self, ncolors, name=None, interpolation='srgb'):
+        """Return the colormap as a `matplotlib.colors.ListedColormap`.
+
+        **Argument:**
+
+        *ncolors*
+            The number of colors in the colormap.
+
+        **Keyword arguments:**
+
+        *name*
+            A name for the colormap.
+
+        *interpolation*
+            As for `colors`.
+
+        """
+        from matplotlib.colors import ListedColormap
+        return ListedColormap(self.colors(ncolors, interpolation),
+                              name=name)
@@ -0,0 +1,63 @@
+"""Tests for creating colormaps."""
+# Copyright (c) 2012 Andrew Dawson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+from __future__ import absolute_import
+
+import numpy as np
+import pytest
+
+from colormaps import (clear_colormap_cache,
+                       create_colormap,
+                       create_colormaps,
+                       create_colors,)
+
+
+@pytest.mark.parametrize('reverse', [False, True])
+@pytest.mark.parametrize('white', [False, True])
+def test_create_colormaps(reverse, white):
+    clear_colormap_cache()
+    lengths = [2, 7, 8, 256]
+    cmaps = create_colormaps('ncl_amwg256', lengths, reverse=reverse,
+                             white=white)
+    for cmap, ncolors in zip(cmaps, lengths):
+        assert not cmap.colors.flags.writeable
+        # The colors are cached for create_colormap and create_colors.
+        assert create_colors(ncolors, 'ncl_amwg256', reverse=reverse,
+                             white=white) is cmap.colors
+    clear_colormap_cache()
+    for cmap, ncolors in zip(cmaps, lengths):
+        np.testing.assert_allclose(
+            cmap.colors, create_colormap(ncolors, 'ncl_amwg256',
+                                         reverse=reverse,
+                                         white=white).colors)
+
+
+def test_create_colormaps_uses_cache():
+    rgb = create_colors(11, 'ncl_amwg256')
+    cmaps = create_colormaps('ncl_amwg256', [11, 12])
+    assert cmaps[0].colors is rgb
+
+
+def test_unknown_base():
+    for function in (create_colors, create_colormap):
+        with pytest.raises(ValueError, match='does not exist'):
+            function(5, 'no_such_base')
+    with pytest.raises(ValueError, match='does not exist'):
+        create_colormaps('no_such_base', [5])
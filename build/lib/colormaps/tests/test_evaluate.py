@@ -0,0 +1,62 @@
+"""Tests for evaluating colormap bases continuously."""
+# Copyright (c) 2012 Andrew Dawson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+from __future__ import absolute_import
+
+import numpy as np
+
+from colormaps import create_continuous_colormap, get_colormap_base
+
+
+def test_wide_white_band():
+    base = get_colormap_base('rainbow')
+    x = np.linspace(0., 1., 101)
+    for white in (.5, .6, .8, .9, .99):
+        rgb = base.evaluate(x, white=white)
+        band = np.abs(x - .5) < white / 2.
+        assert (rgb[band] == 1.).all()
+        assert np.isfinite(rgb).all()
+    rgb = base.evaluate(np.array([.51]), white=.9)
+    assert (rgb == 1.).all()
+
+
+def test_wide_white_band_colormap():
+    cmap = create_continuous_colormap('rainbow', white=.8)
+    assert (cmap(np.array([.51]))[:, :3] == 1.).all()
+
+
+def test_ends_unchanged_by_band():
+    base = get_colormap_base('rainbow')
+    x = np.array([0., 1.])
+    np.testing.assert_allclose(base.evaluate(x, white=.9), base.evaluate(x))
+
+
+def test_resampled_colormap():
+    cmap = create_continuous_colormap('rainbow').with_extremes(
+        under='k', over='w', bad='r')
+    for lutsize in (10, 1000):
+        resampled = cmap.resampled(lutsize)
+        assert resampled.N == lutsize
+        np.testing.assert_allclose(resampled(lutsize - 1),
+                                   cmap(np.array(1.)))
+        assert resampled(-1) == (0., 0., 0., 1.)
+        assert resampled(lutsize) == (1., 1., 1., 1.)
+        assert resampled(np.ma.masked_all(1))[0].tolist() == [1, 0, 0, 1]
+    assert cmap(3) == create_continuous_colormap('rainbow')(3)
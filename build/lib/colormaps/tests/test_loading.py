@@ -0,0 +1,60 @@
+"""Tests for loading colormap bases from palette files."""
+# Copyright (c) 2012 Andrew Dawson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+from __future__ import absolute_import
+import os
+
+import numpy as np
+import pytest
+
+import colormaps.colormaps
+from colormaps.colormaps import (_PACKAGE_DIR,
+                                 _LazyColormapBase,
+                                 _load_dtype,)
+
+
+def _load(path, dtype, monkeypatch):
+    monkeypatch.setattr(colormaps.colormaps, '_LOAD_DTYPE', np.dtype(dtype))
+    path = os.path.join(_PACKAGE_DIR, 'palette', *path.split('/'))
+    return _LazyColormapBase('test_loading', path).load()
+
+
+@pytest.mark.parametrize('path,uint8', [
+    ('whbk.txt', True),
+    ('brewer/sequential/Blues_09.txt', True),
+    ('ncl/ncl_amwg256.txt', False)])
+def test_load_dtype(path, uint8, monkeypatch):
+    reference = _load(path, np.float64, monkeypatch)
+    base = _load(path, np.float32, monkeypatch)
+    assert base.dtype == np.float32
+    np.testing.assert_allclose(base.colors, reference.colors, atol=1e-7)
+    base = _load(path, np.uint8, monkeypatch)
+    assert base.dtype == (np.uint8 if uint8 else np.float32)
+    np.testing.assert_allclose(base.colors, reference.colors, atol=1e-6)
+
+
+def test_load_dtype_option(monkeypatch):
+    monkeypatch.setenv('COLORMAPS_DTYPE', 'float32')
+    assert _load_dtype() == np.float32
+    monkeypatch.setenv('COLORMAPS_DTYPE', 'no such type')
+    assert _load_dtype() == np.float64
+    assert _load_dtype('uint8') == np.uint8
+    with pytest.raises(ValueError):
+        _load_dtype('int16')
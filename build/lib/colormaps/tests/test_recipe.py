@@ -0,0 +1,49 @@
+"""Tests for colormap recipes."""
+# Copyright (c) 2012 Andrew Dawson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+from __future__ import absolute_import
+
+import numpy as np
+import pytest
+
+from colormaps import ColormapRecipe, create_colors
+
+
+def test_reversed_matches_create_colors():
+    recipe = ColormapRecipe('rainbow')
+    for ncolors in (2, 7, 256):
+        np.testing.assert_allclose(recipe.colors(ncolors),
+                                   create_colors(ncolors, 'rainbow'))
+        np.testing.assert_allclose(recipe.reversed().colors(ncolors),
+                                   create_colors(ncolors, 'rainbow',
+                                                 reverse=True))
+
+
+def test_zero_weights_rejected():
+    recipe = ColormapRecipe('rainbow')
+    with pytest.raises(ValueError):
+        recipe.concat(ColormapRecipe('whbk'), weights=[0, 0])
+
+
+def test_zero_weight_part_dropped():
+    recipe = ColormapRecipe('rainbow')
+    joined = recipe.concat(ColormapRecipe('whbk'), weights=[1, 0])
+    assert joined == recipe
+    np.testing.assert_allclose(joined.colors(5), recipe.colors(5))
@@ -21,20 +21,58 @@
 from __future__ import absolute_import
 
 from .colormaps import (create_colormap,
+                        create_colormaps,
+                        create_colors,
+                        create_continuous_colormap,
                         register_colormap_base,
+                        register_colormap_bases,
+                        colormap_registry_generation,
+                        freeze,
                         list_colormap_bases,
                         get_colormap_base_names,
                         get_colormap_base,
+                        refresh_colormap_bases,
                         show_colormap,
+                        set_colormap_cache_size,
+                        colormap_cache_info,
+                        clear_colormap_cache,
                         ColormapBase,)
+from .colorize import apply, apply_chunks
+from .levels import create_level_colormap, apply_levels
+from .recipe import ColormapRecipe
+from .instrument import profiling, profiling_stats, reset_profiling_stats
+from .shared import (share_colormap_bases,
+                     attach_colormap_bases,
+                     release_shared_colormap_bases,)
 
 
 __all__ = ['create_colormap',
+           'create_colormaps',
+           'create_colors',
+           'create_continuous_colormap',
+           'create_level_colormap',
            'register_colormap_base',
+           'register_colormap_bases',
+           'colormap_registry_generation',
+           'freeze',
            'list_colormap_bases',
            'get_colormap_base_names',
            'get_colormap_base',
+           'refresh_colormap_bases',
            'show_colormap',
-           'ColormapBase', ]
+           'set_colormap_cache_size',
+           'colormap_cache_info',
+           'clear_colormap_cache',
+           'ColormapBase',
+           'ColormapRecipe',
+           'apply',
+           'apply_chunks',
+           'apply_levels',
+           'share_colormap_bases',
+           'attach_colormap_bases',
+           'release_shared_colormap_bases',
+           'profiling',
+           'profiling_stats',
+           'reset_profiling_stats', ]
 
 __version__ = '1.0.x'
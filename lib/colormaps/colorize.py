@@ -0,0 +1,345 @@
+"""Direct mapping of data values to RGBA colors."""
+# Copyright (c) 2012 Andrew Dawson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+from __future__ import absolute_import, division
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+
+import numpy as np
+
+from .colormaps import _colormap_rgb, _to_uint8, get_colormap_base
+
+
+# Default number of data values processed at a time.
+_CHUNKSIZE = 1 << 20
+
+
+def _float_dtype(dtype):
+    """Return the floating point type `matplotlib.colors.Normalize`
+    scales values of *dtype* in.
+
+    Floating point types are kept; integer and boolean types of two
+    bytes or less become float32 and others float64.
+
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind in 'biu':
+        dtype = np.promote_types(dtype, np.float32)
+    return dtype
+
+
+class _Colorizer(object):
+    """Map data values to RGBA colors through a uint8 lookup table."""
+
+    def __init__(self, lut, vmin, vmax, bad=(0., 0., 0., 0.)):
+        ncolors = lut.shape[0]
+        table = np.empty([ncolors + 1, 4], dtype=np.uint8)
+        table[:ncolors] = lut
+        bad = tuple(bad)
+        if len(bad) not in (3, 4):
+            raise ValueError('bad color must be an RGB or RGBA tuple')
+        table[ncolors] = _to_uint8(bad + (1.,) * (4 - len(bad)))
+        table.flags.writeable = False
+        self.table = table
+        self.ncolors = ncolors
+        self.vmin = vmin
+        self.span = vmax - vmin
+
+    def __call__(self, data, out, scratch=None):
+        """Colorize the array *data* into the uint8 array *out*.
+
+        *out* must be C-contiguous with the shape of *data* plus a
+        trailing dimension of length 4. *scratch* is an optional pair
+        of floating point and intp work arrays at least as long as
+        *data*, from `scratch`, which avoids allocating temporaries
+        when called repeatedly.
+
+        """
+        values = np.ma.getdata(data).reshape(-1)
+        size = values.size
+        if scratch is None:
+            scratch = self.scratch(size, values.dtype)
+        positions = scratch[0][:size]
+        indices = scratch[1][:size]
+        # Scale in the same type and order of operations as a
+        # `matplotlib.colors.Normalize` followed by a colormap, so that
+        # values on the edges of colors are rounded the same way.
+        if self.span:
+            np.subtract(values, self.vmin, out=positions,
+                        casting='same_kind')
+            np.divide(positions, self.span, out=positions,
+                      casting='same_kind')
+            positions *= self.ncolors
+        else:
+            positions.fill(0.)
+            positions[np.isnan(values)] = np.nan
+        np.clip(positions, 0, self.ncolors - 1, out=positions)
+        bad = np.isnan(positions)
+        mask = np.ma.getmask(data)
+        if mask is not np.ma.nomask:
+            bad |= mask.reshape(-1)
+        with np.errstate(invalid='ignore'):
+            np.copyto(indices, positions, casting='unsafe')
+        indices[bad] = self.ncolors
+        self.table.take(indices, axis=0, out=out.reshape(-1, 4))
+
+    @staticmethod
+    def scratch(size, dtype=np.float64):
+        """Return work arrays for colorizing *size* values of *dtype*."""
+        return (np.empty(size, dtype=_float_dtype(dtype)),
+                np.empty(size, dtype=np.intp))
+
+    def blocks(self, data, out, chunksize=_CHUNKSIZE, threads=1):
+        """Colorize *data* into *out* a block of rows at a time.
+
+        If *threads* is greater than 1 the blocks are colorized
+        concurrently in a pool of that many threads. The numpy
+        operations used release the GIL, and each block is written to
+        its own part of *out*, so the result is identical to the serial
+        one.
+
+        """
+        if data.flags.c_contiguous:
+            # Flatten so the blocks are not limited to whole rows.
+            data = data.reshape(-1)
+            out = out.reshape(-1, 4)
+        row_size = int(np.prod(data.shape[1:]))
+        rows = max(1, chunksize // max(1, row_size))
+        starts = range(0, data.shape[0], rows)
+        block_size = min(data.shape[0], rows) * row_size
+        if threads <= 1 or len(starts) <= 1:
+            scratch = self.scratch(block_size, data.dtype)
+            for start in starts:
+                self(data[start:start + rows], out[start:start + rows],
+                     scratch=scratch)
+            return
+        local = threading.local()
+
+        def colorize_block(start):
+            try:
+                scratch = local.scratch
+            except AttributeError:
+                scratch = local.scratch = self.scratch(block_size,
+                                                       data.dtype)
+            self(data[start:start + rows], out[start:start + rows],
+                 scratch=scratch)
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            # Consume the results so exceptions in workers are raised.
+            for _ in executor.map(colorize_block, starts):
+                pass
+
+
+def _colormap_lut(ncolors, base, reverse, white):
+    """Return an RGBA uint8 lookup table for a colormap."""
+    if white:
+        rgb = _colormap_rgb(ncolors, base, reverse, white)
+        lut = np.empty([ncolors, 4], dtype=np.uint8)
+        lut[:, :3] = _to_uint8(rgb)
+        lut[:, 3] = 255
+        return lut
+    lut = get_colormap_base(base).lut(ncolors, alpha=True)
+    return lut[::-1] if reverse else lut
+
+
+def _data_limits(data, vmin, vmax):
+    """Fill in missing limits from the finite values of *data*."""
+    if data is not None and (vmin is None or vmax is None):
+        values = np.ma.masked_invalid(data, copy=False)
+        if not values.count():
+            # There are no valid values, so any limits will do.
+            values = np.zeros(1)
+        if vmin is None:
+            vmin = values.min()
+        if vmax is None:
+            vmax = values.max()
+    # Limits are float64 scalars, as in matplotlib, so that float32 data
+    # are scaled in float64 before being rounded.
+    vmin, vmax = np.float64(vmin), np.float64(vmax)
+    if vmin > vmax:
+        raise ValueError('vmin must not be greater than vmax')
+    return vmin, vmax
+
+
+def _check_out(out, shape):
+    if out is None:
+        return np.empty(shape + (4,), dtype=np.uint8)
+    if (out.dtype != np.uint8 or out.shape != shape + (4,) or
+            not out.flags.c_contiguous or not out.flags.writeable):
+        raise ValueError('out must be a writeable C-contiguous uint8 '
+                         'array of shape {!r}'.format(shape + (4,)))
+    return out
+
+
+def apply(data,
+          base='rainbow',
+          ncolors=256,
+          vmin=None,
+          vmax=None,
+          reverse=False,
+          white=False,
+          bad=(0., 0., 0., 0.),
+          out=None,
+          chunksize=_CHUNKSIZE,
+          threads=1):
+    """Map data values directly to 8-bit RGBA colors.
+
+    The result is the same as normalizing *data* with
+    `matplotlib.colors.Normalize` and calling the colormap returned by
+    `create_colormap` with ``bytes=True``, but without the floating
+    point temporaries matplotlib allocates for the whole array. Values
+    below *vmin* or above *vmax* are given the first and last colors of
+    the colormap.
+
+    Returns a uint8 array with the shape of *data* plus a trailing
+    dimension of length 4.
+
+    **Argument:**
+
+    *data*
+        An array of data values. Masked and NaN values are given the
+        *bad* color.
+
+    **Keyword arguments:**
+
+    *base*, *ncolors*, *reverse*, *white*
+        Define the colormap, as for `create_colormap`. *ncolors*
+        defaults to 256.
+
+    *vmin*, *vmax*
+        The data values mapped to the start and end of the colormap.
+        Default to the minimum and maximum valid values of *data*.
+
+    *bad*
+        The RGB or RGBA color (in the range 0 to 1) for masked and NaN
+        values. Defaults to transparent black.
+
+    *out*
+        A C-contiguous uint8 array to write the colors into, for reuse
+        across calls. If not given a new array is returned.
+
+    *chunksize*
+        The approximate number of data values colorized at a time,
+        which limits the size of temporary arrays. Defaults to 2**20.
+
+    *threads*
+        The number of threads used to colorize blocks of *chunksize*
+        values concurrently. If *None* the number of CPUs is used.
+        Defaults to 1, which colorizes serially. The result does not
+        depend on the number of threads.
+
+    """
+    data = np.asanyarray(data)
+    vmin, vmax = _data_limits(data, vmin, vmax)
+    out = _check_out(out, data.shape)
+    colorizer = _Colorizer(_colormap_lut(ncolors, base, reverse, white),
+                           vmin, vmax, bad=bad)
+    if threads is None:
+        threads = os.cpu_count() or 1
+    colorizer.blocks(data, out, chunksize=chunksize, threads=threads)
+    return out
+
+
+def apply_chunks(chunks,
+                 base='rainbow',
+                 ncolors=256,
+                 vmin=None,
+                 vmax=None,
+                 reverse=False,
+                 white=False,
+                 bad=(0., 0., 0., 0.),
+                 out=None,
+                 chunksize=_CHUNKSIZE,
+                 threads=1):
+    """Colorize data chunk by chunk, yielding 8-bit RGBA chunks.
+
+    This is a generator version of `apply` for data that do not fit
+    in memory, such as a `numpy.memmap` or an iterator over blocks of
+    a file. The lookup table is built once and reused for every chunk,
+    so peak memory is bounded by the chunk size rather than the size of
+    the data.
+
+    **Argument:**
+
+    *chunks*
+        Either an array-like object with a *shape* attribute that
+        supports slicing (e.g. `numpy.memmap`), which is read in blocks
+        of rows of about *chunksize* values, or an iterable of arrays
+        that are colorized one at a time.
+
+    **Keyword arguments:**
+
+    *vmin*, *vmax*
+        The data values mapped to the start and end of the colormap.
+        Both are required since the data are never seen all at once.
+
+    *out*
+        An optional C-contiguous uint8 array (e.g. a writeable
+        `numpy.memmap`) with the shape of the whole data plus a trailing
+        dimension of length 4. Each chunk is written into the next rows
+        of *out* and the generator yields views of those rows instead
+        of new arrays.
+
+    *base*, *ncolors*, *reverse*, *white*, *bad*, *chunksize*, *threads*
+        As for `apply`.
+
+    """
+    if vmin is None or vmax is None:
+        raise ValueError('vmin and vmax are required for chunked data')
+    vmin, vmax = _data_limits(None, vmin, vmax)
+    colorizer = _Colorizer(_colormap_lut(ncolors, base, reverse, white),
+                           vmin, vmax, bad=bad)
+    if threads is None:
+        threads = os.cpu_count() or 1
+    if hasattr(chunks, 'shape') and hasattr(chunks, '__getitem__'):
+        if out is not None:
+            out = _check_out(out, tuple(chunks.shape))
+        chunks = _row_blocks(chunks, chunksize)
+    elif out is not None:
+        out = _check_out(out, out.shape[:-1])
+    row = 0
+    for chunk in chunks:
+        chunk = np.asanyarray(chunk)
+        if chunk.ndim == 0:
+            chunk = chunk.reshape(1)
+        if out is None:
+            chunk_out = np.empty(chunk.shape + (4,), dtype=np.uint8)
+        else:
+            chunk_out = out[row:row + chunk.shape[0]]
+            if chunk_out.shape != chunk.shape + (4,):
+                raise ValueError('chunk of shape {!r} does not fit in out '
+                                 'at row {:d}'.format(chunk.shape, row))
+        row += chunk.shape[0]
+        colorizer.blocks(chunk, chunk_out, chunksize=chunksize,
+                         threads=threads)
+        yield chunk_out
+
+
+def _row_blocks(data, chunksize):
+    """Yield blocks of rows of *data* of about *chunksize* values."""
+    shape = tuple(data.shape)
+    if not shape:
+        yield data[()]
+        return
+    row_size = int(np.prod(shape[1:]))
+    rows = max(1, chunksize // max(1, row_size))
+    for start in range(0, shape[0], rows):
+        yield data[start:start + rows]
@@ -19,22 +19,215 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 from __future__ import absolute_import, print_function
+from collections import namedtuple, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import gc
+import hashlib
 import os
 import re
+import threading
 
 import numpy as np
-from matplotlib.colors import ListedColormap
-from scipy.interpolate import interp1d
 
+from .bundle import read_bundle, write_bundle
+from .colorspace import check_space, from_srgb, to_srgb
+from .instrument import count, timed
 
-# Dictionary to store colormap bases.
-_BASES = {}
+
+class _Registry(object):
+    """A registry of colormap bases, keyed by name.
+
+    Reads take no lock: the registered bases are held in a dictionary
+    that is never modified once published, together with a generation
+    number. Writers hold a lock while they build an updated copy of the
+    dictionary and then publish it, with the generation incremented, in
+    a single assignment. Readers therefore always see a consistent
+    snapshot, and anything derived from the registry can be cached
+    against its generation.
+
+    Bases found on disk are registered as `_LazyColormapBase`
+    placeholders, which are replaced by the loaded base (without
+    changing the generation) when first requested.
+
+    """
+
+    def __init__(self):
+        self._state = ({}, 0)
+        # Held by writers; re-entrant so that compound updates can hold it
+        # across several calls.
+        self.lock = threading.RLock()
+
+    def __contains__(self, name):
+        return name in self._state[0]
+
+    def __getitem__(self, name):
+        return self._state[0][name]
+
+    def snapshot(self):
+        """Return the current (bases, generation) pair."""
+        return self._state
+
+    @property
+    def generation(self):
+        return self._state[1]
+
+    def names(self):
+        return list(self._state[0])
+
+    def update(self, bases=(), overwrite=False, remove=()):
+        """Atomically remove the names *remove*, then register *bases*.
+
+        Raises `ValueError`, and leaves the registry unchanged, if a base
+        would replace an existing one and *overwrite* is *False*.
+
+        """
+        with self.lock:
+            current, generation = self._state
+            updated = dict(current)
+            for name in remove:
+                del updated[name]
+            for base in bases:
+                if base.name in updated and not overwrite:
+                    raise ValueError('colormap base already exists: '
+                                     '{!s}'.format(base.name))
+                updated[base.name] = base
+            self._state = (updated, generation + 1)
+
+    def materialize(self, name, placeholder, base):
+        """Replace a placeholder with the base it loaded, if still
+        registered.
+
+        """
+        with self.lock:
+            current, _ = self._state
+            if current.get(name) is placeholder:
+                # Readers see either the placeholder or the base, both of
+                # which are valid, so the dictionary can be modified in
+                # place without a new generation.
+                current[name] = base
+
+
+# The registry of colormap bases.
+_REGISTRY = _Registry()
+
+# The type used to store the colors of bases loaded from palette files and
+# bundles, set by `_load_colormap_bases`.
+_LOAD_DTYPE = np.dtype(np.float64)
+
+# Palette files found on disk: maps each file to its modification time (in
+# ns) and the name of the registered base loaded from it, or None if that
+# base has since been replaced by `register_colormap_base`. Also maps the
+# name of each base loaded from a file back to the file.
+_FILE_INDEX = {}
+_SOURCE_FILES = {}
+
+# Directories searched for palette files: maps each directory to an
+# `_IndexedDir` recording its modification time and contents.
+_DIR_INDEX = {}
+
+# Pattern matching header lines of a palette file.
+_HEADER_RE = re.compile(r'^\s*#.*:\s+.*$')
+
+# Location of the compiled palette bundle (see `colormaps.compile`).
+_PACKAGE_DIR = os.path.abspath(os.path.dirname(__file__))
+_BUNDLE_FILE = os.path.join(_PACKAGE_DIR, 'palette.bundle')
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class _ColormapCache(object):
+    """A thread-safe least-recently-used cache of colormap colors.
+
+    Keys are tuples whose first element is the name of the colormap base
+    the colors were created from, or a `ColormapRecipe` whose
+    *base_names* are the bases used.
+
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                raise
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            if self.maxsize == 0:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._trim()
+
+    def _trim(self):
+        if self.maxsize is not None:
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            self._trim()
+
+    def discard_base(self, name):
+        """Remove all entries created from the colormap base *name*."""
+        with self._lock:
+            for key in [key for key in self._entries
+                        if key[0] == name or
+                        name in getattr(key[0], 'base_names', ())]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize,
+                             len(self._entries))
+
+
+# Cache of the colors of colormaps returned by `create_colormap`.
+_CACHE = _ColormapCache()
+
+
+# Lengths of the lookup tables cached by `ColormapBase.lut`, in addition to
+# the native length of each base.
+_STANDARD_LUT_LENGTHS = (256, 1024, 4096)
 
 
 class ColormapBase(object):
-    """A container for base colors and associated meta-data."""
+    """A container for base colors and associated meta-data.
+
+    Meta-data other than the name and description are held in the
+    `attributes` dictionary, and can also be read as attributes of the
+    instance (e.g. ``base.source``).
 
-    def __init__(self, name, colors, description=None, attributes=None):
+    A registered base is pickled by name and content hash, and
+    unpickled by looking the name up in the registry of the receiving
+    process. Other bases are pickled with their colors.
+
+    """
+
+    __slots__ = ('name', 'description', 'attributes', 'ncolors',
+                 '_colors', '_luts', '_digest', '_spaces')
+
+    def __init__(self, name, colors, description=None, attributes=None,
+                 dtype=None):
         """Create a `ColormapBase` instance.
 
         **Arguments:**
@@ -47,29 +240,303 @@ class ColormapBase(object):
 
         *colors*
             A `numpy.ndarray` dimensions (N, 3) containing N RGB
-            triples.
+            triples, either in the range 0 to 1 or 0 to 255. The array
+            is copied, never modified.
+
+        *attributes*
+            A dictionary of additional meta-data.
+
+        *dtype*
+            The type used to store the colors: `numpy.float64` (the
+            default), `numpy.float32` or `numpy.uint8`. 8-bit storage
+            is only possible for colors given as integers in the range
+            0 to 255.
 
         """
         self.name = name
         self.description = description if description is not None else ''
-        self.colors = self._process_colors(colors)
-        self.ncolors = len(colors)
+        self.attributes = dict(attributes) if attributes else {}
+        self._colors = self._process_colors(colors, dtype)
+        self.ncolors = len(self._colors)
+        self._luts = None
+        self._digest = None
+        self._spaces = None
+
+    def __getattr__(self, key):
+        # Only called when normal attribute lookup fails, so fall back to
+        # the meta-data. The mapping is fetched directly to avoid infinite
+        # recursion before __init__ has set it (e.g. when unpickling).
+        try:
+            return object.__getattribute__(self, 'attributes')[key]
+        except (AttributeError, KeyError):
+            raise AttributeError('{!r} object has no attribute '
+                                 '{!r}'.format(type(self).__name__, key))
+
+    @property
+    def colors(self):
+        """The base colors, an (N, 3) array of RGB values in the range
+        0 to 1.
+
+        The array is read-only. Assigning new colors discards any lookup
+        tables computed by `lut`. If the colors are stored as 8-bit
+        integers a new float64 array is computed on each access.
+
+        """
+        if self._colors.dtype == np.uint8:
+            colors = self._colors / 255.
+            colors.flags.writeable = False
+            return colors
+        return self._colors
+
+    @colors.setter
+    def colors(self, colors):
+        self._colors = self._process_colors(colors, self._colors.dtype)
+        self.ncolors = len(self._colors)
+        self._luts = None
+        self._digest = None
+        self._spaces = None
+        # Colormaps already created from this base are now out of date.
+        _CACHE.discard_base(self.name)
+
+    @property
+    def dtype(self):
+        """The type used to store the colors."""
+        return self._colors.dtype
+
+    def lut(self, ncolors=None, alpha=False):
+        """Return the colors as an 8-bit lookup table.
+
+        The colors are interpolated to *ncolors* (the number of base
+        colors by default) and converted to uint8 values the way
+        matplotlib does for ``bytes=True``. Tables for the native
+        length and the standard lengths 256, 1024 and 4096 are computed
+        once and cached. The returned array is C-contiguous and
+        read-only.
+
+        **Keyword arguments:**
+
+        *ncolors*
+            The number of colors in the table.
+
+        *alpha*
+            If *True* the table has a fourth, fully opaque, alpha
+            column. Defaults to *False*.
+
+        """
+        if ncolors is None:
+            ncolors = self.ncolors
+        key = (ncolors, bool(alpha))
+        try:
+            return self._luts[key]
+        except (KeyError, TypeError):
+            pass
+        lut = np.empty([ncolors, 4 if alpha else 3], dtype=np.uint8)
+        if ncolors == self.ncolors and self._colors.dtype == np.uint8:
+            lut[:, :3] = self._colors
+        elif ncolors == self.ncolors:
+            lut[:, :3] = _to_uint8(self._colors)
+        else:
+            lut[:, :3] = _to_uint8(_interpolate_colors(self.colors, ncolors))
+        if alpha:
+            lut[:, 3] = 255
+        lut.flags.writeable = False
+        if ncolors in (self.ncolors,) + _STANDARD_LUT_LENGTHS:
+            if self._luts is None:
+                self._luts = {}
+            self._luts[key] = lut
+        return lut
+
+    def evaluate(self, x, reverse=False, white_width=0., alpha=False,
+                 interpolation='srgb', out=None):
+        """Map values in the range 0 to 1 continuously to colors.
+
+        The value 0 maps to the first base color and 1 to the last,
+        with the colors between interpolated linearly, as for a
+        colormap from `create_colormap` with a very large number of
+        colors but without creating one. Values outside the range 0 to
+        1 are given the first or last color and NaN values NaN colors.
+        Calling the base, ``base(x, ...)``, is the same as calling this
+        method.
+
+        Returns an array of RGB (or RGBA) values in the range 0 to 1,
+        with the shape of *x* plus a trailing dimension of length 3 (or
+        4).
+
+        **Argument:**
+
+        *x*
+            An array of values.
+
+        **Keyword arguments:**
+
+        *reverse*
+            If *True* 0 maps to the last base color and 1 to the first.
+            Defaults to *False*.
+
+        *white_width*
+            The width of a band of white centred on 0.5, as a fraction
+            of the range 0 to 1 (at least 0 and less than 1). The base
+            colors are squeezed into the remainder of the range, as for
+            the white cells *white* inserts in `create_colormap`.
+            Defaults to 0, no band.
+
+        *alpha*
+            If *True* a fourth, fully opaque, alpha channel is included.
+            Defaults to *False*.
+
+        *interpolation*
+            The color space to interpolate in, as for `create_colormap`.
+            Defaults to 'srgb'.
+
+        *out*
+            A C-contiguous floating point array of the shape of the
+            result to write the colors into. If not given a new float64
+            array is returned.
+
+        """
+        check_space(interpolation)
+        if not 0 <= white_width < 1:
+            raise ValueError('white_width must be at least 0 and less '
+                             'than 1')
+        x = np.asarray(x)
+        shape = x.shape + (4 if alpha else 3,)
+        if out is None:
+            out = np.empty(shape)
+        elif (out.shape != shape or out.dtype.kind != 'f' or
+                not out.flags.c_contiguous or not out.flags.writeable):
+            raise ValueError('out must be a writeable C-contiguous floating '
+                             'point array of shape {!r}'.format(shape))
+        # Fractional positions along the base, computed in one array that
+        # becomes the interpolation weights.
+        positions = np.clip(x, 0., 1., dtype=np.float64).reshape(-1)
+        invalid = np.isnan(positions)
+        positions[invalid] = 0.
+        if reverse:
+            np.subtract(1., positions, out=positions)
+        if white_width:
+            band = np.abs(positions - .5) < white_width / 2.
+            positions -= white_width * (positions > .5)
+            positions /= 1. - white_width
+            # Positions inside the band are overwritten with white, but
+            # must stay in range to be interpolated first.
+            np.clip(positions, 0., 1., out=positions)
+        positions *= self.ncolors - 1
+        rgb = out.reshape(-1, shape[-1])[:, :3]
+        values = self._colors_in(interpolation)
+        if self.ncolors == 1:
+            rgb[...] = values
+        else:
+            lower = positions.astype(np.intp)
+            np.minimum(lower, self.ncolors - 2, out=lower)
+            positions -= lower
+            _blend(values, lower, positions, rgb)
+        if interpolation != 'srgb':
+            rgb[...] = to_srgb(rgb, interpolation)
+        if white_width:
+            rgb[band] = 1.
+        rgb[invalid] = np.nan
+        if alpha:
+            out.reshape(-1, 4)[:, 3] = 1.
+        return out
+
+    __call__ = evaluate
+
+    def __reduce__(self):
+        # A registered base is pickled by reference: the receiving process
+        # looks it up in its own registry and checks it has the same
+        # colors. Other bases are pickled with their colors.
+        bases, _ = _REGISTRY.snapshot()
+        if bases.get(self.name) is self:
+            return _registered_base, (self.name, self._content_digest())
+        return _unpickle_base, (self.name, self._colors, self.description,
+                                self.attributes)
+
+    def __copy__(self):
+        # Copies are never the registered base itself, unlike unpickled
+        # bases, so they can be changed without affecting the registry.
+        # The colors are read-only, so a shallow copy can share them.
+        return type(self)._from_view(self.name, self._colors,
+                                     self.description, self.attributes)
+
+    def __deepcopy__(self, memo):
+        colors = self._colors.copy()
+        colors.flags.writeable = False
+        return type(self)._from_view(self.name, colors, self.description,
+                                     copy.deepcopy(self.attributes, memo))
+
+    def _content_digest(self):
+        """Return a hash of the colors, computed once."""
+        digest = self._digest
+        if digest is None:
+            colors = np.ascontiguousarray(self.colors, dtype='<f8')
+            digest = self._digest = hashlib.sha1(colors.tobytes()).hexdigest()
+        return digest
+
+    def _colors_in(self, space):
+        """Return the colors converted to the color space *space*.
+
+        Conversions are computed once and cached. The returned array is
+        read-only.
+
+        """
+        if space == 'srgb':
+            return self.colors
+        if self._spaces is None:
+            self._spaces = {}
         try:
-            for key, value in attributes.items():
-                setattr(self, key, value)
-        except AttributeError:
+            return self._spaces[space]
+        except KeyError:
             pass
+        values = from_srgb(self.colors, space)
+        values.flags.writeable = False
+        self._spaces[space] = values
+        return values
 
-    def _process_colors(self, colors):
+    @classmethod
+    def _from_view(cls, name, colors, description='', attributes=None):
+        """Create a base whose colors are *colors* itself, not a copy.
+
+        *colors* must be a read-only (N, 3) array already scaled to 0-1,
+        such as a view of shared or packed storage.
+
+        """
+        base = cls.__new__(cls)
+        base.name = name
+        base.description = description
+        base.attributes = dict(attributes) if attributes else {}
+        base._colors = colors
+        base.ncolors = len(colors)
+        base._luts = None
+        base._digest = None
+        base._spaces = None
+        return base
+
+    def _process_colors(self, colors, dtype=None):
+        """Return a read-only copy of *colors* scaled to 0-1."""
         try:
             if colors.ndim != 2 or colors.shape[1] != 3:
                 raise ValueError
         except (AttributeError, ValueError):
             raise ValueError('colors must be an Nx3 array: '
                              '{!s}'.format(self.name))
-        if (colors > 1.).any():
-            colors /= 255.
-        return colors
+        dtype = np.dtype(np.float64 if dtype is None else dtype)
+        if dtype == np.uint8:
+            if (colors < 0).any() or (colors > 255).any() or \
+                    (colors != np.round(colors)).any() or \
+                    not (colors > 1).any():
+                raise ValueError('8-bit storage needs colors given as '
+                                 'integers from 0 to 255: '
+                                 '{!s}'.format(self.name))
+            processed = colors.astype(np.uint8)
+        elif dtype in (np.float32, np.float64):
+            processed = np.array(colors, dtype=dtype)
+            if (processed > 1.).any():
+                processed /= 255.
+        else:
+            raise ValueError('colors must be stored as float64, float32 '
+                             'or uint8: {!s}'.format(self.name))
+        processed.flags.writeable = False
+        return processed
 
 
 def register_colormap_base(base, overwrite=False):
@@ -88,11 +555,98 @@ def register_colormap_base(base, overwrite=False):
         the same name if one exists.
 
     """
-    global _BASES
-    if base.name in _BASES.keys() and not overwrite:
-        raise ValueError('colormap base already exists: '
-                         '{!s}'.format(base.name))
-    _BASES[base.name] = base
+    with _REGISTRY.lock:
+        replaced = base.name in _REGISTRY
+        _REGISTRY.update([base], overwrite=overwrite)
+        if replaced:
+            # The base no longer comes from a palette file.
+            _forget_source(base.name)
+
+
+def register_colormap_bases(bases, overwrite=False):
+    """Register several colormap bases at once.
+
+    The bases are registered atomically: either all of them are
+    registered or, if any of them cannot be, none are.
+
+    **Argument:**
+
+    *bases*
+        A sequence of `ColormapBase` instances to register.
+
+    **Keyword argument:**
+
+    *overwrite*
+        As for `register_colormap_base`.
+
+    """
+    bases = list(bases)
+    with _REGISTRY.lock:
+        replaced = [base.name for base in bases if base.name in _REGISTRY]
+        _REGISTRY.update(bases, overwrite=overwrite)
+        for name in replaced:
+            _forget_source(name)
+
+
+def colormap_registry_generation():
+    """Return the generation number of the colormap base registry.
+
+    The number increases every time bases are registered or removed,
+    so it can be used to invalidate anything derived from the
+    registered bases.
+
+    """
+    return _REGISTRY.generation
+
+
+def freeze():
+    """Finalize the colormap bases before forking worker processes.
+
+    Every registered base is loaded and the colors of all bases are
+    packed into one contiguous array, with each base's colors a view of
+    it. The garbage collector is then frozen (see `gc.freeze`) so it
+    does not touch the existing objects. Forked processes can therefore
+    share the pages holding the colors instead of each dirtying its own
+    copy of many small arrays.
+
+    Bases registered after this call are stored separately until it is
+    called again.
+
+    """
+    with _REGISTRY.lock:
+        bases, _ = _REGISTRY.snapshot()
+        _pack_colors([_load_base(bases[name]) for name in sorted(bases)])
+    gc.collect()
+    gc.freeze()
+
+
+def _pack_colors(bases):
+    """Move the colors of *bases* into one read-only array per dtype."""
+    groups = OrderedDict()
+    for base in bases:
+        groups.setdefault(base.dtype, []).append(base)
+    for group in groups.values():
+        arena = np.concatenate([base._colors for base in group])
+        arena.flags.writeable = False
+        start = 0
+        for base in group:
+            # The values are unchanged, so readers may see either array.
+            base._colors = arena[start:start + base.ncolors]
+            start += base.ncolors
+
+
+def _forget_source(name):
+    try:
+        palette_file = _SOURCE_FILES.pop(name)
+    except KeyError:
+        return
+    _FILE_INDEX[palette_file] = (None, _FILE_INDEX[palette_file][1])
+
+
+def _record_source(name, palette_file, stat):
+    _FILE_INDEX[palette_file] = (name, stat.st_mtime_ns)
+    if name is not None:
+        _SOURCE_FILES[name] = palette_file
 
 
 def list_colormap_bases(name=None, full=False):
@@ -109,10 +663,10 @@ def list_colormap_bases(name=None, full=False):
         will also be printed. Defaults to *False*.
 
     """
-    bases = _BASES.keys() if name is None else [name]
+    bases = _REGISTRY.names() if name is None else [name]
     for basename in sorted(bases):
         try:
-            base = _BASES[basename]
+            base = _get_base(basename)
             print('{base.name}: {base.description}'.format(base=base))
             if full:
                 for color in base.colors:
@@ -124,7 +678,7 @@ def list_colormap_bases(name=None, full=False):
 
 def get_colormap_base_names():
     """Return a list of the names of all colormap bases."""
-    return sorted(_BASES.keys())
+    return sorted(_REGISTRY.names())
 
 
 def get_colormap_base(name):
@@ -137,20 +691,127 @@ def get_colormap_base(name):
 
     """
     try:
-        base = _BASES[name]
+        base = _get_base(name)
     except KeyError:
         raise ValueError('colormap base does not exist: '
                          '{!s}'.format(name))
     return base
 
 
+def _get_base(name):
+    """Return the registered base *name*, loading it if required.
+
+    Raises `KeyError` if no base named *name* is registered.
+
+    """
+    return _load_base(_REGISTRY[name])
+
+
+def _load_base(base):
+    """Return *base*, or the base it loads if it is a placeholder."""
+    if isinstance(base, _LazyColormapBase):
+        placeholder = base
+        base = placeholder.get()
+        _REGISTRY.materialize(placeholder.name, placeholder, base)
+    return base
+
+
+def _registered_base(name, digest):
+    """Unpickle a base pickled by reference."""
+    try:
+        base = _get_base(name)
+    except KeyError:
+        raise ValueError('cannot unpickle colormap base, it is not '
+                         'registered: {!s}'.format(name))
+    if base._content_digest() != digest:
+        raise ValueError('cannot unpickle colormap base, the registered '
+                         'colors differ: {!s}'.format(name))
+    return base
+
+
+def _unpickle_base(name, colors, description, attributes):
+    """Unpickle a base pickled with its colors."""
+    colors.flags.writeable = False
+    return ColormapBase._from_view(name, colors, description, attributes)
+
+
+def _recipe_colormap(rgb, name, base, ncolors, reverse, white,
+                     interpolation):
+    """Return a colormap of the colors *rgb* created from *base*."""
+    # Imported here so that importing this package, and generating
+    # colors, do not require matplotlib.
+    from ._mpl import Colormap
+    cmap = Colormap(rgb, name=name)
+    cmap._recipe = (base, base._content_digest(), rgb,
+                    (ncolors, bool(reverse), bool(white), interpolation))
+    return cmap
+
+
+def _unpickle_colormap(recipe, state):
+    """Unpickle a colormap pickled as a recipe."""
+    name, digest, ncolors, reverse, white, interpolation = recipe
+    _registered_base(name, digest)
+    cmap = create_colormap(ncolors, name, reverse=reverse, white=white,
+                           interpolation=interpolation)
+    vars(cmap).update(state)
+    return cmap
+
+
+def create_continuous_colormap(base='rainbow',
+                               name=None,
+                               reverse=False,
+                               white_width=0.,
+                               interpolation='srgb',
+                               ncolors=256):
+    """Create a matplotlib colormap that varies continuously.
+
+    Instead of a fixed number of colors, the colormap maps each value
+    with `ColormapBase.evaluate`, so no large table of colors is needed
+    for smooth color gradients.
+
+    **Keyword arguments:**
+
+    *base*
+        Name of the colormap base to build the colormap from, or a
+        `ColormapBase` instance.
+
+    *name*
+        Name for the new colormap. Defaults to the name of the base.
+
+    *reverse*, *white_width*, *interpolation*
+        As for `ColormapBase.evaluate`.
+
+    *ncolors*
+        The number of colors in the lookup table matplotlib keeps, which
+        is used for integer values and by colorbars. Defaults to 256.
+
+    """
+    if not isinstance(base, ColormapBase):
+        base = get_colormap_base(base)
+    check_space(interpolation)
+    if not 0 <= white_width < 1:
+        raise ValueError('white_width must be at least 0 and less than 1')
+    from ._mpl import ContinuousColormap
+    return ContinuousColormap(base, name=name, ncolors=ncolors,
+                              reverse=reverse,
+                              white_width=white_width,
+                              interpolation=interpolation)
+
+
+@timed('create_colormap')
 def create_colormap(ncolors,
                     base='rainbow',
                     name=None,
                     reverse=False,
-                    white=False):
+                    white=False,
+                    interpolation='srgb'):
     """Create a colormap from a set of base colors.
 
+    Returns a `matplotlib.colors.ListedColormap`. It is pickled as the
+    name and content hash of its base and the arguments below rather
+    than as its colors, so the process that unpickles it must have the
+    same colormap base registered (see `attach_colormap_bases`).
+
     **Argument:**
 
     *ncolors*
@@ -178,70 +839,416 @@ def create_colormap(ncolors,
         even-length colormaps. If *False* no white cells are inserted.
         Defaults to *False*.
 
+    *interpolation*
+        The color space the base colors are interpolated in: 'srgb'
+        (the default) interpolates the sRGB values directly,
+        'linear_rgb' interpolates linear light intensities and 'lab'
+        interpolates in CIELAB, which gives more perceptually even
+        steps between widely spaced base colors. Colors that are not
+        interpolated, because *ncolors* matches the length of the base,
+        are the same in every space.
+
     """
+    rgb, base = _colormap_source(ncolors, base, reverse, white,
+                                 interpolation)
+    return _recipe_colormap(rgb, name, base, ncolors, reverse, white,
+                            interpolation)
+
+
+def create_colors(ncolors, base='rainbow', reverse=False, white=False,
+                  interpolation='srgb'):
+    """Create the colors of a colormap from a set of base colors.
+
+    Returns the colors of the colormap that `create_colormap` would
+    return, as a read-only (*ncolors*, 3) array of RGB values in the
+    range 0 to 1. Unlike `create_colormap` this does not need
+    matplotlib.
+
+    **Argument:**
+
+    *ncolors*
+        The number of colors required.
+
+    **Keyword arguments:**
+
+    *base*, *reverse*, *white*, *interpolation*
+        As for `create_colormap`.
+
+    """
+    return _colormap_rgb(ncolors, base, reverse, white, interpolation)
+
+
+def _colormap_rgb(ncolors, base, reverse, white, interpolation='srgb'):
+    """Return the (read-only) colors of a colormap, using the cache."""
+    return _colormap_source(ncolors, base, reverse, white, interpolation)[0]
+
+
+def _colormap_source(ncolors, base, reverse, white, interpolation='srgb'):
+    """Return the (read-only) colors of a colormap, using the cache,
+    and the `ColormapBase` they were created from.
+
+    """
+    check_space(interpolation)
+    bases, generation = _REGISTRY.snapshot()
+    key = (base, ncolors, bool(reverse), bool(white), interpolation,
+           generation)
     try:
         # Retrieve the colormap base.
-        base = _BASES[base]
+        base = _load_base(bases[base])
+    except KeyError:
+        raise ValueError('colormap base does not exist: '
+                         '{!s}'.format(base))
+    try:
+        return _CACHE[key], base
     except KeyError:
-        raise ValueError()
+        pass
+    rgb = _interpolate_base(base, ncolors, reverse, white, interpolation)
+    rgb.flags.writeable = False
+    _CACHE[key] = rgb
+    return rgb, base
+
+
+def _interpolate_base(base, ncolors, reverse, white, interpolation='srgb'):
+    """Compute the colors of a colormap from a `ColormapBase`.
+
+    The colors are written straight into their final rows of a single
+    output array: reversing only changes which rows those are, and any
+    white cells are filled in around them.
+
+    """
     rgb = base.colors
     # If white fills are needed, then work out how many.
     nwhite = 2 - ncolors % 2 if white else 0
     ncolors_interp = (ncolors - nwhite)
+    result = np.empty([ncolors, 3])
+    middle, lower_rows, upper_rows = _colormap_rows(result, nwhite, reverse)
     # Get the required colors.
     base_length = rgb.shape[0]
     if base_length == ncolors_interp:
         # Don't need to interpolate if the number of colors required is the
         # same as the number of colors in the colormap base.
-        rgb_interp = rgb.copy()
-    else:
+        lower_rows[...] = rgb[:middle]
+        upper_rows[...] = rgb[middle:]
+        count('copied')
+    elif interpolation == 'srgb':
         # Interpolate the colormap base colors to get the required number.
-        x0 = np.arange(0, base_length)
-        x1 = np.linspace(0, base_length-1, ncolors_interp)
-        red = np.interp(x1, x0, rgb[:, 0])
-        green = np.interp(x1, x0, rgb[:, 1])
-        blue = np.interp(x1, x0, rgb[:, 2])
-        rgb_interp = np.array([red, green, blue]).transpose()
-    if white:
-        # Add white to the center of the colormap.
-        rgb_white = np.ones([ncolors, 3])
-        interp_middle = ncolors_interp // 2
-        rgb_white[:interp_middle] = rgb_interp[:interp_middle]
-        rgb_white[interp_middle + nwhite:] = rgb_interp[interp_middle:]
-        rgb_interp = rgb_white
-    if reverse:
-        # Reverse the colors.
-        rgb_interp = rgb_interp[::-1]
-    return ListedColormap(rgb_interp, name=name)
+        positions = np.linspace(0, base_length - 1, ncolors_interp)
+        _interpolate_into(rgb, positions[:middle], lower_rows)
+        _interpolate_into(rgb, positions[middle:], upper_rows)
+        count('interpolated')
+    else:
+        # Interpolate in another color space and convert back.
+        rgb_interp = to_srgb(_interpolate_colors(
+            base._colors_in(interpolation), ncolors_interp), interpolation)
+        lower_rows[...] = rgb_interp[:middle]
+        upper_rows[...] = rgb_interp[middle:]
+        count('interpolated')
+    return result
 
 
-def _find_palette_files():
-    root_path = os.path.abspath(os.path.dirname(__file__))
-    palette_paths = [os.path.join(root_path, 'palette')]
+def _colormap_rows(result, nwhite, reverse):
+    """Fill the *nwhite* white cells in the centre of the colormap colors
+    *result*, and return the views of *result* the interpolated colors
+    go in.
+
+    Returns the number of interpolated colors before the white cells,
+    and the views they and the remaining colors are written into.
+    Reversing only changes which rows those are.
+
+    """
+    rows = result[::-1] if reverse else result
+    # The interpolated colors go either side of the white cells.
+    middle = (result.shape[0] - nwhite) // 2
+    rows[middle:middle + nwhite] = 1.
+    return middle, rows[:middle], rows[middle + nwhite:]
+
+
+def _to_uint8(rgb):
+    """Convert colors in the range 0-1 to 8-bit integers.
+
+    Values are truncated rather than rounded, which is what matplotlib
+    does when a colormap is called with ``bytes=True``.
+
+    """
+    return (np.asarray(rgb) * 255).astype(np.uint8)
+
+
+def _interpolate_colors(colors, ncolors):
+    """Linearly resample the rows of an (N, C) color array."""
+    positions = np.linspace(0, colors.shape[0] - 1, ncolors)
+    return _interpolate_at(colors, positions)
+
+
+def _interpolate_at(colors, positions):
+    """Linearly interpolate the rows of an (N, C) color array.
+
+    *positions* are fractional row indices in the range [0, N - 1]; the
+    array is overwritten with the interpolation weights. The indices
+    are computed once and shared by all channels, which are blended
+    directly into a C-contiguous (len(positions), C) array.
+
+    """
+    result = np.empty([len(positions), colors.shape[1]])
+    return _interpolate_into(colors, positions, result)
+
+
+def _interpolate_into(colors, positions, out):
+    """As `_interpolate_at`, but writes the result into the rows of
+    *out*, which may be any (len(positions), C) view.
+
+    """
+    base_length = colors.shape[0]
+    if base_length == 1:
+        out[...] = colors
+        return out
+    weight = positions
+    lower = weight.astype(np.intp)
+    np.minimum(lower, base_length - 2, out=lower)
+    weight -= lower
+    return _blend(colors, lower, weight, out)
+
+
+def _blend(colors, lower, weight, out):
+    """Set the rows of *out* to ``colors[lower]`` plus *weight* times the
+    step to the next row of *colors*.
+
+    """
+    steps = np.diff(colors, axis=0)
+    for channel in range(colors.shape[1]):
+        # Blending one channel at a time keeps the temporaries 1-D and
+        # small, which is faster than broadcasting over (ncolors, C).
+        column = out[:, channel]
+        colors[:, channel].take(lower, out=column)
+        column += steps[:, channel].take(lower) * weight
+    return out
+
+
+def create_colormaps(base, ncolors_list, reverse=False, white=False,
+                     interpolation='srgb'):
+    """Create several colormaps of different lengths from one base.
+
+    This is equivalent to calling `create_colormap` for each length in
+    *ncolors_list*, but all of the colors are interpolated together in
+    a single pass, which is much faster when many lengths are required.
+    The colormaps are returned in a list in the same order as
+    *ncolors_list*.
+
+    **Arguments:**
+
+    *base*
+        Name of the colormap base to build the colormaps from.
+
+    *ncolors_list*
+        A sequence of the numbers of colors required in each colormap.
+
+    **Keyword arguments:**
+
+    *reverse*
+        If *True* the colors of each colormap will be in the reverse
+        order. Defaults to *False*.
+
+    *white*
+        If *True* white cells will be inserted into the centre of each
+        colormap, as in `create_colormap`. Defaults to *False*.
+
+    *interpolation*
+        The color space to interpolate in, as for `create_colormap`.
+        Defaults to 'srgb'.
+
+    """
+    check_space(interpolation)
+    bases, generation = _REGISTRY.snapshot()
+    name = base
+    try:
+        # Retrieve the colormap base.
+        base = _load_base(bases[name])
+    except KeyError:
+        raise ValueError('colormap base does not exist: '
+                         '{!s}'.format(name))
+    ncolors_list = [int(ncolors) for ncolors in ncolors_list]
+    # The same keys as `_colormap_source`, so colors are shared with
+    # `create_colormap` through the cache.
+    keys = [(name, ncolors, bool(reverse), bool(white), interpolation,
+             generation) for ncolors in ncolors_list]
+    rgbs = []
+    for key in keys:
+        try:
+            rgbs.append(_CACHE[key])
+        except KeyError:
+            rgbs.append(None)
+    missing = [i for i, rgb in enumerate(rgbs) if rgb is None]
+    values = base._colors_in(interpolation)
+    base_length = values.shape[0]
+    missing_ncolors = np.array([ncolors_list[i] for i in missing],
+                               dtype=np.intp)
+    nwhite = (2 - missing_ncolors % 2 if white else
+              np.zeros_like(missing_ncolors))
+    ncolors_interp = missing_ncolors - nwhite
+    # Row positions in the base for every color of every colormap, laid
+    # end to end: within each colormap they run evenly from 0 to N - 1.
+    ends = np.cumsum(ncolors_interp)
+    starts = ends - ncolors_interp
+    scale = (base_length - 1.) / np.maximum(ncolors_interp - 1, 1)
+    positions = np.arange(ends[-1] if len(ends) else 0, dtype=float)
+    positions -= np.repeat(starts, ncolors_interp)
+    positions *= np.repeat(scale, ncolors_interp)
+    # Lay the positions out in the rows their colors take in the output,
+    # as in `_interpolate_base`, so that all of the colors are
+    # interpolated straight into place in a single pass. The second
+    # column marks the white cells, which are filled in afterwards.
+    out_ends = np.cumsum(missing_ncolors)
+    out_starts = out_ends - missing_ncolors
+    layout = np.zeros([out_ends[-1] if len(out_ends) else 0, 2])
+    for start, end, out_start, out_end, nwhite_i in zip(
+            starts.tolist(), ends.tolist(), out_starts.tolist(),
+            out_ends.tolist(), nwhite.tolist()):
+        middle, lower_rows, upper_rows = _colormap_rows(
+            layout[out_start:out_end], nwhite_i, reverse)
+        lower_rows[:, 0] = positions[start:start + middle]
+        upper_rows[:, 0] = positions[start + middle:end]
+    result = to_srgb(_interpolate_at(values, layout[:, 0].copy()),
+                     interpolation)
+    result[layout[:, 1] == 1.] = 1.
+    outputs = [result[out_start:out_end]
+               for out_start, out_end in zip(out_starts, out_ends)]
+    # The colors of each colormap are views of this array, which must
+    # not be modified as they are shared through the cache.
+    result.flags.writeable = False
+    for i, rgb in zip(missing, outputs):
+        rgb.flags.writeable = False
+        _CACHE[keys[i]] = rgbs[i] = rgb
+    return [_recipe_colormap(rgb, None, base, ncolors, reverse, white,
+                             interpolation)
+            for rgb, ncolors in zip(rgbs, ncolors_list)]
+
+
+def set_colormap_cache_size(maxsize):
+    """Set the size of the cache used by `create_colormap`.
+
+    The colors of the most recently created colormaps are cached so that
+    repeated calls to `create_colormap` with the same arguments do not
+    recompute them. Cached color arrays are read-only, so they can be
+    shared safely between the colormaps that use them.
+
+    **Argument:**
+
+    *maxsize*
+        The maximum number of colormaps to cache. If *None* the cache
+        can grow without bound, if 0 caching is disabled. The default
+        size is 128.
+
+    """
+    if maxsize is not None and maxsize < 0:
+        raise ValueError('cache size must not be negative')
+    _CACHE.resize(maxsize)
+
+
+def colormap_cache_info():
+    """Return statistics for the cache used by `create_colormap`.
+
+    The return value is a named tuple with the fields *hits*, *misses*,
+    *maxsize* and *currsize*.
+
+    """
+    return _CACHE.info()
+
+
+def clear_colormap_cache():
+    """Empty the cache used by `create_colormap` and reset its
+    statistics.
+
+    """
+    _CACHE.clear()
+
+
+def _palette_dirs():
+    """Return the palette directories to search.
+
+    Returns a list of (directory, user) pairs, where *user* is *False*
+    for the palette directory of the package and *True* for directories
+    listed in the PYTHON_COLORMAPS environment variable.
+
+    """
+    palette_dirs = [(os.path.join(_PACKAGE_DIR, 'palette'), False)]
     palette_env = os.getenv('PYTHON_COLORMAPS')
     try:
-        palette_paths.extend(palette_env.split(':'))
+        palette_dirs.extend((palette_dir, True)
+                            for palette_dir in palette_env.split(':')
+                            if palette_dir)
     except AttributeError:
         pass
+    return palette_dirs
+
+
+_IndexedDir = namedtuple('_IndexedDir', ['mtime', 'files', 'subdirs'])
+
+
+def _scan_dir(dirpath, mtime):
+    """List the palette files and subdirectories of one directory."""
+    files = []
+    subdirs = []
+    try:
+        entries = os.scandir(dirpath)
+    except OSError:
+        return _IndexedDir(mtime, files, subdirs)
+    with entries:
+        for entry in entries:
+            if entry.is_dir():
+                # Like os.walk, do not descend into symbolic links.
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+            elif os.path.splitext(entry.name)[1] == '.txt':
+                files.append(entry.path)
+    return _IndexedDir(mtime, files, subdirs)
+
+
+@timed('find_palette_files')
+def _walk_palette_dir(palette_dir, index=None, previous=None):
+    """Return the palette files in *palette_dir* and its subdirectories.
+
+    Files are listed in the same order as by `os.walk`. If *index* is
+    given it is filled with an `_IndexedDir` for every directory
+    visited. Directories whose modification time is unchanged since
+    they were recorded in the index *previous* are not listed again.
+
+    """
+    if index is None:
+        index = {}
+    if previous is None:
+        previous = {}
     palette_files = []
-    for palette_dir in palette_paths:
-        for root, dirs, files in os.walk(palette_dir):
-            palette_files.extend([os.path.join(root, filename)
-                                  for filename in files
-                                  if os.path.splitext(filename)[1] == '.txt'])
+    pending = [palette_dir]
+    while pending:
+        dirpath = pending.pop()
+        try:
+            mtime = os.stat(dirpath).st_mtime_ns
+        except OSError:
+            continue
+        indexed = previous.get(dirpath)
+        if indexed is None or indexed.mtime != mtime:
+            indexed = _scan_dir(dirpath, mtime)
+        index[dirpath] = indexed
+        palette_files.extend(indexed.files)
+        pending.extend(reversed(indexed.subdirs))
     return palette_files
 
 
-def _colormap_file_parser(filename, prefix=None, suffix=None):
-    with open(filename, 'r') as f:
-        header = filter(lambda line: re.match('^\s*#.*:\s+.*$', line),
-                        f.readlines())
+def _find_palette_files():
+    palette_files = []
+    for palette_dir, _ in _palette_dirs():
+        palette_files.extend(_walk_palette_dir(palette_dir))
+    return palette_files
+
+
+def _parse_header(lines, filename, prefix=None, suffix=None):
+    """Extract the name, description and attributes from header lines."""
+    header = filter(_HEADER_RE.match, lines)
     body_template = ''.join(filter(None, [prefix, '{!s}', suffix]))
     cmap_name = None
     cmap_description = None
     cmap_attributes = {}
     for line in header:
-        line = line.replace('#', '', 1).split(':')
+        line = line.replace('#', '', 1).split(':', 1)
         head = line[0].strip().lower()
         body = line[1].strip()
         if head == 'name':
@@ -252,20 +1259,447 @@ def _colormap_file_parser(filename, prefix=None, suffix=None):
             cmap_attributes[head] = body
     if cmap_name is None:
         raise ValueError('missing name in file: {!s}'.format(filename))
-    cmap_colors = np.loadtxt(filename)
-    base = ColormapBase(cmap_name,
-                        cmap_colors,
-                        description=cmap_description,
-                        attributes=cmap_attributes,)
-    return base
+    return cmap_name, cmap_description, cmap_attributes
+
+
+@timed('scan_palette_header', per_file=True)
+def _scan_palette_header(filename):
+    """Read only the leading comment block of a palette file."""
+    lines = []
+    with open(filename, 'r') as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped and not stripped.startswith('#'):
+                break
+            lines.append(line)
+    return _parse_header(lines, filename)
+
+
+def _parse_rows(rows, filename):
+    """Convert (line number, text) pairs of color data to an array."""
+    fields = [text.split() for _, text in rows]
+    try:
+        return np.array(fields, dtype=float)
+    except ValueError:
+        pass
+    # Find the first malformed row to give a useful error message.
+    ncolumns = len(fields[0])
+    for (lineno, _), row in zip(rows, fields):
+        if len(row) != ncolumns:
+            raise ValueError('expected {:d} columns but found {:d} at line '
+                             '{:d} of file: {!s}'.format(ncolumns, len(row),
+                                                         lineno, filename))
+        for column, value in enumerate(row, 1):
+            try:
+                float(value)
+            except ValueError:
+                raise ValueError('invalid value {!r} at line {:d}, column '
+                                 '{:d} of file: {!s}'.format(value, lineno,
+                                                             column,
+                                                             filename))
+    raise ValueError('cannot parse colors in file: {!s}'.format(filename))
+
+
+@timed('parse_palette_file', per_file=True)
+def _colormap_file_parser(filename, prefix=None, suffix=None):
+    header = []
+    rows = []
+    with open(filename, 'r') as f:
+        for lineno, line in enumerate(f, 1):
+            text, hash_, _ = line.partition('#')
+            text = text.strip()
+            if text:
+                rows.append((lineno, text))
+            elif hash_:
+                header.append(line)
+    cmap_name, cmap_description, cmap_attributes = _parse_header(
+        header, filename, prefix=prefix, suffix=suffix)
+    if not rows:
+        raise ValueError('no colors in file: {!s}'.format(filename))
+    cmap_colors = _parse_rows(rows, filename)
+    return _loaded_base(cmap_name, cmap_colors, cmap_description,
+                        cmap_attributes)
+
+
+def _loaded_base(name, colors, description, attributes):
+    """Create a base loaded from disk, with colors stored as the type
+    `_LOAD_DTYPE`.
+
+    Colors given in the range 0 to 1 are stored as 8-bit integers if
+    they are multiples of 1/255 to the six decimal places palette files
+    use. Colors that cannot be stored as 8-bit integers are stored as
+    float32 instead.
+
+    """
+    dtype = _LOAD_DTYPE
+    if dtype == np.uint8:
+        scaled = colors if (colors > 1.).any() else colors * 255.
+        rounded = np.round(scaled)
+        if np.allclose(scaled, rounded, rtol=0., atol=255e-6):
+            try:
+                return ColormapBase(name, rounded, description, attributes,
+                                    dtype=dtype)
+            except ValueError:
+                # For example a palette of all black.
+                pass
+        dtype = np.dtype(np.float32)
+    return ColormapBase(name, colors, description, attributes, dtype=dtype)
+
+
+class _LazyColormapBase(object):
+    """Placeholder for a colormap base that has not been parsed yet."""
+
+    def __init__(self, name, filename):
+        self.name = name
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._base = None
+
+    def get(self):
+        """Return the base, loading it the first time.
+
+        Threads that ask for the base concurrently wait for a single
+        load, so they all get the same object.
+
+        """
+        with self._lock:
+            if self._base is None:
+                self._base = self.load()
+            return self._base
+
+    def load(self):
+        base = _colormap_file_parser(self.filename)
+        # The registered name comes from the header scan, so use it even if
+        # the full parse finds a different one later in the file.
+        base.name = self.name
+        return base
+
+
+class _BundledColormapBase(_LazyColormapBase):
+    """Placeholder for a colormap base stored in a palette bundle."""
+
+    def __init__(self, entry, data, filename):
+        super(_BundledColormapBase, self).__init__(entry['name'], filename)
+        self.entry = entry
+        self.data = data
+
+    def load(self):
+        start = self.entry['offset']
+        # ColormapBase copies the colors out of the memory-mapped bundle.
+        colors = self.data[start:start + self.entry['ncolors']]
+        return _loaded_base(self.name, colors, self.entry['description'],
+                            self.entry['attributes'])
+
+
+def _bundle_key(filename, bundle_dir):
+    """Key identifying a palette file in the index of a bundle.
+
+    Files inside the bundle directory are keyed by their relative path
+    so that a bundle built in a source tree remains valid once the
+    package is installed elsewhere.
+
+    """
+    filename = os.path.abspath(filename)
+    relname = os.path.relpath(filename, bundle_dir)
+    if relname.startswith(os.pardir):
+        return filename.replace(os.sep, '/')
+    return relname.replace(os.sep, '/')
+
+
+def _read_palette_bundle(filename):
+    """Return the entries of a bundle keyed by file, and its mtime."""
+    try:
+        mtime = os.stat(filename).st_mtime
+        entries, data = read_bundle(filename)
+    except (IOError, OSError, ValueError):
+        return {}, None
+    bundled = dict((entry['path'], (entry, data)) for entry in entries)
+    return bundled, mtime
+
+
+def _bundle_record(base, **extra):
+    """Return a record describing *base* for `write_bundle`."""
+    record = {'name': base.name,
+              'description': base.description,
+              'attributes': base.attributes,
+              'colors': base.colors}
+    record.update(extra)
+    return record
+
+
+def _palette_cache_file(palette_dir):
+    """Name of the parse cache file for a user palette directory."""
+    cache_home = os.getenv('XDG_CACHE_HOME') or \
+        os.path.join(os.path.expanduser('~'), '.cache')
+    key = hashlib.sha1(os.path.abspath(palette_dir).encode('utf-8'))
+    return os.path.join(cache_home, 'colormaps', key.hexdigest() + '.bundle')
+
+
+def _map(function, items, threads=1):
+    """Return a list of *function* applied to *items*, in order.
 
+    If *threads* is greater than 1 the calls are made concurrently in a
+    pool of that many threads, which helps when they are dominated by
+    file system latency. The first exception raised (in the order of
+    *items*) is propagated, as for a sequential loop.
 
-def _load_colormap_bases():
-    """Load colormap bases from file."""
-    palette_files = _find_palette_files()
-    for palette_file in palette_files:
-        base = _colormap_file_parser(palette_file)
-        register_colormap_base(base)
+    """
+    if threads <= 1 or len(items) <= 1:
+        return [function(item) for item in items]
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(function, items))
+
+
+def _load_cached_palettes(palette_dir, palette_files, stats, threads=1):
+    """Return the bases in user palette files, using the parse cache.
+
+    Each user palette directory has a cache (a palette bundle) of the
+    parsed contents of its files, keyed by path, size and modification
+    time. Files that are not in the cache or have changed since it was
+    written are parsed and the cache is rewritten. Because the cache is
+    replaced atomically, concurrent processes can at worst repeat each
+    other's work.
+
+    """
+    cache_file = _palette_cache_file(palette_dir)
+    cached, _ = _read_palette_bundle(cache_file)
+    paths = [os.path.abspath(palette_file) for palette_file in palette_files]
+    bases = []
+    records = []
+    for palette_file, path, stat in zip(palette_files, paths, stats):
+        try:
+            entry, data = cached.pop(path)
+        except KeyError:
+            entry = None
+        if (entry is not None and entry['size'] == stat.st_size and
+                entry['mtime'] == stat.st_mtime_ns):
+            bases.append(_BundledColormapBase(entry, data, palette_file))
+            start = entry['offset']
+            records.append(dict(entry,
+                                colors=data[start:start + entry['ncolors']]))
+        else:
+            bases.append(None)
+            records.append(None)
+    stale = [i for i, base in enumerate(bases) if base is None]
+    parsed = _map(_colormap_file_parser,
+                  [palette_files[i] for i in stale], threads)
+    for i, base in zip(stale, parsed):
+        bases[i] = base
+        records[i] = _bundle_record(base, path=paths[i],
+                                    size=stats[i].st_size,
+                                    mtime=stats[i].st_mtime_ns)
+    if stale or cached:
+        try:
+            if not os.path.isdir(os.path.dirname(cache_file)):
+                os.makedirs(os.path.dirname(cache_file))
+            write_bundle(cache_file, records)
+        except (IOError, OSError):
+            # The cache is only an optimization, so carry on without it.
+            pass
+    return bases
+
+
+def _scan_palette_file(palette_file):
+    name, _, _ = _scan_palette_header(palette_file)
+    return _LazyColormapBase(name, palette_file)
+
+
+def _palette_file_bases(palette_files, user, bundled, bundle_mtime,
+                        palette_dir=None, threads=1):
+    """Return (unregistered) bases for a list of palette files.
+
+    Returns a list of (base, stat) pairs, where *stat* is the result of
+    `os.stat` for the file. *bundled* and *bundle_mtime* describe the
+    compiled palette bundle, as returned by `_read_palette_bundle`. If
+    *user* is *True*, files that are not bundled are loaded through the
+    parse cache of *palette_dir*.
+
+    """
+    bundle_dir = os.path.dirname(_BUNDLE_FILE)
+    stats = _map(os.stat, palette_files, threads)
+    bases = [None] * len(palette_files)
+    if bundled:
+        for i, (palette_file, stat) in enumerate(zip(palette_files, stats)):
+            try:
+                entry, data = bundled[_bundle_key(palette_file, bundle_dir)]
+            except KeyError:
+                continue
+            if stat.st_mtime <= bundle_mtime:
+                bases[i] = _BundledColormapBase(entry, data, palette_file)
+    unbundled = [i for i, base in enumerate(bases) if base is None]
+    unbundled_files = [palette_files[i] for i in unbundled]
+    if user and unbundled:
+        loaded = _load_cached_palettes(palette_dir, unbundled_files,
+                                       [stats[i] for i in unbundled],
+                                       threads=threads)
+    else:
+        loaded = _map(_scan_palette_file, unbundled_files, threads)
+    for i, base in zip(unbundled, loaded):
+        bases[i] = base
+    return list(zip(bases, stats))
+
+
+def _palette_dir_bases(palette_dir, user, bundled, bundle_mtime, threads=1,
+                       index=None):
+    """Return (unregistered) bases for the palette files in a directory.
+
+    See `_palette_file_bases` for the arguments and return value. If
+    *index* is given it is filled in by `_walk_palette_dir`.
+
+    """
+    palette_files = _walk_palette_dir(palette_dir, index=index)
+    return palette_files, _palette_file_bases(
+        palette_files, user, bundled, bundle_mtime, palette_dir=palette_dir,
+        threads=threads)
+
+
+def _load_threads(threads=None):
+    if threads is None:
+        try:
+            threads = int(os.getenv('COLORMAPS_LOAD_THREADS', 1))
+        except ValueError:
+            threads = 1
+    return threads
+
+
+def _load_dtype(dtype=None):
+    dtypes = (np.float64, np.float32, np.uint8)
+    if dtype is None:
+        try:
+            dtype = np.dtype(os.getenv('COLORMAPS_DTYPE', 'float64'))
+        except TypeError:
+            dtype = None
+        return dtype if dtype in dtypes else np.dtype(np.float64)
+    dtype = np.dtype(dtype)
+    if dtype not in dtypes:
+        raise ValueError('colors must be stored as float64, float32 or '
+                         'uint8, not {!s}'.format(dtype))
+    return dtype
+
+
+@timed('load_colormap_bases')
+def _load_colormap_bases(threads=None, dtype=None):
+    """Register colormap bases found on disk.
+
+    Bases stored in the palette bundle are taken from there, unless the
+    palette file has been modified since the bundle was written. Bases
+    in user palette directories come from the parse cache. Only the
+    header of any other palette file is read here, the colors are
+    parsed the first time a base is requested.
+
+    Files are read by *threads* threads, which defaults to the value of
+    the COLORMAPS_LOAD_THREADS environment variable, or 1. Bases are
+    always registered in the same order, so the result (including any
+    error for duplicate names) does not depend on the number of
+    threads.
+
+    The colors of the bases are stored as *dtype*, which defaults to the
+    value of the COLORMAPS_DTYPE environment variable, or float64. The
+    type applies to every base loaded from disk afterwards, including
+    bases first parsed when requested and those picked up by
+    `refresh_colormap_bases`.
+
+    """
+    global _LOAD_DTYPE
+    threads = _load_threads(threads)
+    _LOAD_DTYPE = _load_dtype(dtype)
+    bundled, bundle_mtime = _read_palette_bundle(_BUNDLE_FILE)
+    sources = []
+    for palette_dir, user in _palette_dirs():
+        palette_files, bases = _palette_dir_bases(
+            palette_dir, user, bundled, bundle_mtime, threads=threads,
+            index=_DIR_INDEX)
+        sources.extend((palette_file, base, stat)
+                       for palette_file, (base, stat) in zip(palette_files,
+                                                             bases))
+    with _REGISTRY.lock:
+        _REGISTRY.update([base for _, base, _ in sources])
+        for palette_file, base, stat in sources:
+            _record_source(base.name, palette_file, stat)
+
+
+RefreshInfo = namedtuple('RefreshInfo', ['added', 'updated', 'removed'])
+
+
+def refresh_colormap_bases():
+    """Pick up changes to the palette files since they were loaded.
+
+    The palette directories are checked for changes using the
+    modification time of each directory, and only directories that
+    have changed are listed again. Bases from palette files that have
+    been added are registered, bases from files that have been removed
+    are unregistered, and bases from files in changed directories that
+    have been modified are replaced. Files edited in place without
+    changing their directory are not detected.
+
+    Bases registered with `register_colormap_base` are not affected,
+    apart from an error being raised if a new palette file uses the
+    name of an existing base.
+
+    Returns a named tuple with the fields *added*, *updated* and
+    *removed*, each a sorted list of base names. A palette file that
+    now declares a different name adds the new name and removes the
+    old one.
+
+    """
+    threads = _load_threads()
+    with _REGISTRY.lock:
+        index = {}
+        palette_files = []
+        for palette_dir, _ in _palette_dirs():
+            palette_files.extend(_walk_palette_dir(palette_dir, index=index,
+                                                   previous=_DIR_INDEX))
+        changed_dirs = [dirpath for dirpath, indexed in index.items()
+                        if _DIR_INDEX.get(dirpath) is not indexed]
+        present = set(palette_files)
+        deleted = [palette_file for palette_file in _FILE_INDEX
+                   if palette_file not in present]
+        candidates = [palette_file for palette_file in palette_files
+                      if palette_file not in _FILE_INDEX]
+        for dirpath in changed_dirs:
+            candidates.extend(palette_file
+                              for palette_file in index[dirpath].files
+                              if palette_file in _FILE_INDEX)
+        stats = _map(os.stat, candidates, threads)
+        changed = [(palette_file, stat)
+                   for palette_file, stat in zip(candidates, stats)
+                   if _FILE_INDEX.get(palette_file, (None, None))[1] !=
+                   stat.st_mtime_ns]
+        bases = _map(_scan_palette_file,
+                     [palette_file for palette_file, _ in changed], threads)
+        # Work out the changes to the registry, and make them all at once.
+        removed = [_FILE_INDEX[palette_file][0] for palette_file in deleted
+                   if _FILE_INDEX[palette_file][0] is not None]
+        replaced = []
+        sources = []
+        for (palette_file, stat), base in zip(changed, bases):
+            old_name = _FILE_INDEX.get(palette_file, (None, None))[0]
+            if palette_file in _FILE_INDEX and old_name is None:
+                # The base from this file was replaced by the user.
+                sources.append((None, palette_file, stat))
+                continue
+            if old_name is not None:
+                replaced.append(old_name)
+            sources.append((base, palette_file, stat))
+        new_bases = [base for base, _, _ in sources if base is not None]
+        if new_bases or removed:
+            _REGISTRY.update(new_bases, remove=removed + replaced)
+        # A name is updated if it is registered again, which includes a
+        # file declaring the name of a file that was removed or renamed.
+        old_names = set(removed + replaced)
+        new_names = set(base.name for base in new_bases)
+        # Now the registry has been updated, record where bases came from.
+        _DIR_INDEX.clear()
+        _DIR_INDEX.update(index)
+        for palette_file in deleted:
+            del _FILE_INDEX[palette_file]
+        for name in removed + replaced:
+            _SOURCE_FILES.pop(name, None)
+        for base, palette_file, stat in sources:
+            _record_source(getattr(base, 'name', None), palette_file, stat)
+    return RefreshInfo(sorted(new_names - old_names),
+                       sorted(new_names & old_names),
+                       sorted(old_names - new_names))
 
 
 # Load colormap bases at import time.
@@ -0,0 +1,91 @@
+"""Compile palette files into a single binary bundle.
+
+Run as::
+
+    python -m colormaps.compile [-o OUTPUT]
+
+All palette files that would be found at import time (including those in
+directories listed in the PYTHON_COLORMAPS environment variable) are
+parsed and written to one bundle, which is memory-mapped at import time
+instead of reading the text files individually.
+
+"""
+# Copyright (c) 2012 Andrew Dawson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+from __future__ import absolute_import, print_function
+import argparse
+import os
+
+from .bundle import write_bundle
+from .colormaps import (_BUNDLE_FILE,
+                        _bundle_key,
+                        _bundle_record,
+                        _colormap_file_parser,
+                        _find_palette_files,
+                        _walk_palette_dir,)
+
+
+def compile_palettes(filename=_BUNDLE_FILE, palette_dir=None):
+    """Compile all palette files into a bundle.
+
+    Returns the number of colormap bases written.
+
+    **Keyword arguments:**
+
+    *filename*
+        Name of the bundle file to write. Defaults to the bundle file
+        read at import time, inside the package directory.
+
+    *palette_dir*
+        A directory whose palette files are compiled, such as the palette
+        directory of a package being built. Defaults to all of the
+        palette directories searched at import time.
+
+    """
+    bundle_dir = os.path.dirname(os.path.abspath(filename))
+    if palette_dir is None:
+        palette_files = _find_palette_files()
+    else:
+        palette_files = _walk_palette_dir(palette_dir)
+    records = []
+    for palette_file in palette_files:
+        base = _colormap_file_parser(palette_file)
+        records.append(_bundle_record(
+            base, path=_bundle_key(palette_file, bundle_dir)))
+    write_bundle(filename, records)
+    return len(records)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m colormaps.compile',
+        description='Compile palette files into a binary bundle.')
+    parser.add_argument('-o', '--output', default=_BUNDLE_FILE,
+                        help='bundle file to write (default: %(default)s)')
+    parser.add_argument('-d', '--palette-dir',
+                        help='compile only the palette files in this '
+                             'directory')
+    args = parser.parse_args(argv)
+    nbases = compile_palettes(args.output, palette_dir=args.palette_dir)
+    print('wrote {:d} colormap bases to {!s}'.format(nbases, args.output))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""Sharing of colormap bases between processes."""
+# Copyright (c) 2012 Andrew Dawson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# The parent process packs every registered base into one shared memory
+# block laid out as a palette bundle (see `colormaps.bundle`). Workers map
+# the block and register bases whose colors are views of it, so the
+# colors are held in memory once however many workers there are.
+from __future__ import absolute_import
+import atexit
+import os
+import threading
+
+from .bundle import pack_bundle, unpack_bundle
+from .colormaps import (_REGISTRY,
+                        _bundle_record,
+                        _load_base,
+                        register_colormap_bases,
+                        ColormapBase,)
+
+
+# Blocks created by this process, keyed by the registry generation they
+# were created from, and blocks attached to by this process. Attached
+# blocks must stay open for as long as their bases are used.
+_CREATED = {}
+_ATTACHED = []
+_LOCK = threading.Lock()
+
+
+def _forget_created():
+    # A forked child inherits the blocks of its parent, which the parent
+    # owns: the child must not remove them when it exits.
+    global _LOCK
+    _LOCK = threading.Lock()
+    _CREATED.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_created)
+
+
+def share_colormap_bases():
+    """Copy all registered colormap bases into shared memory.
+
+    Returns the name of a `multiprocessing.shared_memory` block that
+    other processes can pass to `attach_colormap_bases`. The block is
+    owned by the calling process and is removed when it exits, or when
+    `release_shared_colormap_bases` is called; child processes created
+    by forking never remove it. Calling this again without registering
+    any bases in between returns the same block.
+
+    A process pool whose workers share the bases of the parent can be
+    created with::
+
+        pool = multiprocessing.Pool(
+            initializer=colormaps.attach_colormap_bases,
+            initargs=(colormaps.share_colormap_bases(),))
+
+    """
+    # Imported here as multiprocessing adds noticeably to import time.
+    from multiprocessing import shared_memory
+    bases, generation = _REGISTRY.snapshot()
+    with _LOCK:
+        try:
+            return _CREATED[generation].name
+        except KeyError:
+            pass
+        records = [_bundle_record(_load_base(bases[name]))
+                   for name in sorted(bases)]
+        header, matrix = pack_bundle(records)
+        block = shared_memory.SharedMemory(
+            create=True, size=max(1, len(header) + matrix.nbytes))
+        try:
+            block.buf[:len(header)] = header
+            block.buf[len(header):len(header) + matrix.nbytes] = \
+                matrix.tobytes()
+        except BaseException:
+            block.close()
+            block.unlink()
+            raise
+        if not _CREATED:
+            atexit.register(release_shared_colormap_bases)
+        _CREATED[generation] = block
+        return block.name
+
+
+def attach_colormap_bases(name):
+    """Register the colormap bases shared by another process.
+
+    The bases replace any registered with the same names. Their colors
+    are read-only views of the shared memory block, so no copies are
+    made. This function can be used directly as the *initializer* of a
+    `multiprocessing.Pool` (see `share_colormap_bases`).
+
+    **Argument:**
+
+    *name*
+        The name of the block returned by `share_colormap_bases`.
+
+    """
+    block = _attach(name)
+    entries, data = unpack_bundle(block.buf)
+    bases = []
+    for entry in entries:
+        start = entry['offset']
+        colors = data[start:start + entry['ncolors']]
+        bases.append(ColormapBase._from_view(entry['name'],
+                                             colors,
+                                             entry['description'],
+                                             entry['attributes']))
+    with _LOCK:
+        _ATTACHED.append(block)
+    register_colormap_bases(bases, overwrite=True)
+
+
+def _attach(name):
+    from multiprocessing import resource_tracker, shared_memory
+
+    class AttachedBlock(shared_memory.SharedMemory):
+
+        def __del__(self):
+            # Registered bases may still hold views of the block when the
+            # process exits, in which case the memory is unmapped once the
+            # views are freed.
+            try:
+                self.close()
+            except BufferError:
+                pass
+
+    try:
+        return AttachedBlock(name=name, track=False)
+    except TypeError:
+        pass
+    # Before Python 3.13 attaching always registers the block with the
+    # resource tracker. Processes started by multiprocessing share the
+    # tracker of their parent, where the block is already registered, but
+    # any other process starts its own tracker, which would remove the
+    # block when the process exits even though it does not own it.
+    private = getattr(resource_tracker._resource_tracker, '_fd', 0) is None
+    block = AttachedBlock(name=name)
+    if private:
+        resource_tracker.unregister(block._name, 'shared_memory')
+    return block
+
+
+def release_shared_colormap_bases():
+    """Remove the shared memory blocks created by
+    `share_colormap_bases`.
+
+    Processes that have already attached to a block keep their bases,
+    but no new process can attach to it. This is called automatically
+    when the process exits.
+
+    """
+    with _LOCK:
+        blocks = list(_CREATED.values())
+        _CREATED.clear()
+    for block in blocks:
+        block.close()
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,90 @@
+"""Tests for colorizing data directly."""
+# Copyright (c) 2012 Andrew Dawson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+from __future__ import absolute_import
+
+from matplotlib.colors import Normalize
+import numpy as np
+
+from colormaps import (apply, apply_chunks, apply_levels, create_colormap,
+                       create_level_colormap)
+
+
+def _edge_values(vmin, vmax, ncolors, dtype=np.float64):
+    """Return values on and next to the edges between colors."""
+    edges = vmin + (vmax - vmin) * np.arange(ncolors + 1) / ncolors
+    edges = edges.astype(dtype)
+    values = [edges]
+    for _ in range(4):
+        values.append(np.nextafter(values[-1], dtype(np.inf)))
+    values.append(edges)
+    for _ in range(4):
+        values.append(np.nextafter(values[-1], dtype(-np.inf)))
+    rng = np.random.RandomState(0)
+    values.append(rng.uniform(vmin - 1., vmax + 1., 1000).astype(dtype))
+    values.append(np.array([np.nan], dtype=dtype))
+    return np.concatenate(values)
+
+
+def _matplotlib_colors(data, vmin, vmax, ncolors, **kwargs):
+    cmap = create_colormap(ncolors, **kwargs).with_extremes(
+        bad=(0., 0., 0., 0.))
+    return cmap(Normalize(vmin, vmax)(data), bytes=True)
+
+
+def test_apply_matches_matplotlib():
+    for vmin, vmax in ((-1e5, 3.3), (0., 1.), (-.1, .7), (3., 3.)):
+        for ncolors in (7, 256):
+            data = _edge_values(vmin, vmax, ncolors)
+            rgba = apply(data, base='rainbow', ncolors=ncolors, vmin=vmin,
+                         vmax=vmax)
+            expected = _matplotlib_colors(data, vmin, vmax, ncolors,
+                                          base='rainbow')
+            assert (rgba[:-1] == expected[:-1]).all()
+            assert (rgba[-1] == 0).all()
+
+
+def test_apply_matches_matplotlib_float32():
+    data = _edge_values(-1e5, 3.3, 256, dtype=np.float32)[:-1]
+    rgba = apply(data, vmin=-1e5, vmax=3.3, reverse=True)
+    expected = _matplotlib_colors(data, -1e5, 3.3, 256, reverse=True)
+    assert (rgba == expected).all()
+    # Limits found from the data are float32 too.
+    rgba = apply(data)
+    expected = _matplotlib_colors(data, data.min(), data.max(), 256)
+    assert (rgba == expected).all()
+
+
+def test_apply_chunks_matches_apply():
+    data = _edge_values(-1e5, 3.3, 256)[:-1].reshape(-1, 10)
+    rgba = apply(data, vmin=-1e5, vmax=3.3)
+    chunks = apply_chunks(data, vmin=-1e5, vmax=3.3, chunksize=50)
+    assert (np.concatenate(list(chunks)) == rgba).all()
+
+
+def test_apply_levels_matches_matplotlib():
+    levels = np.array([-1e5, -3., 0., .1, 3.3])
+    data = np.concatenate([_edge_values(levels[i], levels[i + 1], 1)
+                           for i in range(len(levels) - 1)])[:-1]
+    for extend in ('neither', 'min', 'max', 'both'):
+        cmap, norm = create_level_colormap(levels, extend=extend)
+        expected = cmap(norm(data), bytes=True)
+        rgba = apply_levels(data, levels, extend=extend)
+        assert (rgba == expected).all()
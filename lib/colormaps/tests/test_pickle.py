@@ -0,0 +1,118 @@
+"""Tests for copying and pickling colormap bases and colormaps."""
+# Copyright (c) 2012 Andrew Dawson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+from __future__ import absolute_import
+import copy
+import pickle
+
+import numpy as np
+import pytest
+
+from colormaps import (ColormapBase,
+                       create_colormap,
+                       create_colors,
+                       create_continuous_colormap,
+                       create_level_colormap,
+                       get_colormap_base,)
+from colormaps._mpl import Colormap, ContinuousColormap, LevelNorm
+
+
+@pytest.mark.parametrize('copier', [copy.copy, copy.deepcopy])
+def test_copy_base_is_independent(copier):
+    base = get_colormap_base('whbk')
+    colors = base.colors.copy()
+    copied = copier(base)
+    assert copied is not base
+    np.testing.assert_array_equal(copied.colors, colors)
+    assert copied.attributes == base.attributes
+    copied.colors = np.zeros((3, 3))
+    copied.attributes['test'] = 1
+    np.testing.assert_array_equal(base.colors, colors)
+    assert 'test' not in base.attributes
+    assert get_colormap_base('whbk') is base
+    assert create_colors(5, 'whbk').max() > 0
+
+
+def test_pickle_registered_base():
+    base = get_colormap_base('whbk')
+    assert pickle.loads(pickle.dumps(base)) is base
+
+
+def test_pickle_unregistered_base():
+    base = ColormapBase('test_pickle', np.eye(3), description='test',
+                        attributes={'source': 'test'})
+    unpickled = pickle.loads(pickle.dumps(base))
+    assert unpickled is not base
+    np.testing.assert_array_equal(unpickled.colors, base.colors)
+    assert unpickled.description == 'test'
+    assert unpickled.source == 'test'
+
+
+def test_pickle_colormap():
+    cmap = create_colormap(11, 'ncl_amwg256', name='test', reverse=True,
+                           white=True)
+    assert isinstance(cmap, Colormap)
+    unpickled = pickle.loads(pickle.dumps(cmap))
+    assert type(unpickled) is Colormap
+    assert unpickled.name == 'test'
+    np.testing.assert_array_equal(unpickled.colors, cmap.colors)
+    np.testing.assert_array_equal(unpickled(np.linspace(0, 1, 20)),
+                                  cmap(np.linspace(0, 1, 20)))
+
+
+def test_pickle_colormap_with_changed_colors():
+    cmap = create_colormap(5, 'whbk')
+    cmap.colors = np.zeros((5, 3))
+    unpickled = pickle.loads(pickle.dumps(cmap))
+    # Pickled with its colors, as it no longer matches its recipe.
+    assert type(unpickled) is Colormap
+    np.testing.assert_array_equal(unpickled.colors, np.zeros((5, 3)))
+    assert create_colors(5, 'whbk').max() > 0
+
+
+def test_copy_colormap():
+    cmap = create_colormap(5, 'whbk')
+    for copied in (copy.copy(cmap), copy.deepcopy(cmap)):
+        assert type(copied) is Colormap
+        np.testing.assert_array_equal(copied.colors, cmap.colors)
+
+
+def test_pickle_continuous_colormap():
+    cmap = create_continuous_colormap('ncl_amwg256', reverse=True,
+                                      white_width=.2)
+    assert isinstance(cmap, ContinuousColormap)
+    x = np.linspace(0, 1, 50)
+    expected = cmap(x)
+    for copied in (pickle.loads(pickle.dumps(cmap)), copy.deepcopy(cmap)):
+        assert type(copied) is ContinuousColormap
+        np.testing.assert_array_equal(copied(x), expected)
+        assert copied(3) == cmap(3)
+    # The registered base is pickled by reference.
+    assert pickle.loads(pickle.dumps(cmap)).base is cmap.base
+
+
+def test_pickle_level_norm():
+    levels = [0, 1, 2, 5, 10]
+    _, norm = create_level_colormap(levels, extend='both')
+    assert isinstance(norm, LevelNorm)
+    x = np.linspace(-1, 11, 50)
+    unpickled = pickle.loads(pickle.dumps(norm))
+    assert type(unpickled) is LevelNorm
+    np.testing.assert_array_equal(unpickled(x), norm(x))
@@ -0,0 +1,147 @@
+"""Tests for picking up changes to palette files."""
+# Copyright (c) 2012 Andrew Dawson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+from __future__ import absolute_import
+import itertools
+import os
+import time
+
+import numpy as np
+import pytest
+
+from colormaps import (ColormapBase,
+                       get_colormap_base,
+                       get_colormap_base_names,
+                       refresh_colormap_bases,
+                       register_colormap_base,)
+from colormaps.colormaps import _REGISTRY
+
+
+# Modification times, moved forward for each change so that changes are
+# detected regardless of the resolution of file system timestamps.
+_MTIMES = itertools.count(int(time.time()) + 10)
+
+
+def _touch(path):
+    mtime = next(_MTIMES) * 10 ** 9
+    os.utime(path, ns=(mtime, mtime))
+
+
+def _write(palette_dir, filename, name, value=0.):
+    path = os.path.join(palette_dir, filename)
+    with open(path, 'w') as palette_file:
+        palette_file.write('# name: {!s}\n'.format(name))
+        for row in range(3):
+            palette_file.write('{0} {0} {0}\n'.format(value + row / 4.))
+    _touch(path)
+    _touch(palette_dir)
+
+
+def _delete(palette_dir, filename):
+    os.remove(os.path.join(palette_dir, filename))
+    _touch(palette_dir)
+
+
+@pytest.fixture
+def palette_dir(tmp_path, monkeypatch):
+    """An empty user palette directory, which is registered."""
+    palette_dir = str(tmp_path)
+    monkeypatch.setenv('PYTHON_COLORMAPS', palette_dir)
+    refresh_colormap_bases()
+    yield palette_dir
+    monkeypatch.delenv('PYTHON_COLORMAPS')
+    refresh_colormap_bases()
+
+
+def test_add(palette_dir):
+    _write(palette_dir, 'user1.txt', 'test_user1')
+    info = refresh_colormap_bases()
+    assert info == (['test_user1'], [], [])
+    assert get_colormap_base('test_user1').ncolors == 3
+
+
+def test_delete(palette_dir):
+    _write(palette_dir, 'user1.txt', 'test_user1')
+    refresh_colormap_bases()
+    _delete(palette_dir, 'user1.txt')
+    info = refresh_colormap_bases()
+    assert info == ([], [], ['test_user1'])
+    assert 'test_user1' not in get_colormap_base_names()
+
+
+def test_update(palette_dir):
+    _write(palette_dir, 'user1.txt', 'test_user1')
+    refresh_colormap_bases()
+    _write(palette_dir, 'user1.txt', 'test_user1', value=.25)
+    info = refresh_colormap_bases()
+    assert info == ([], ['test_user1'], [])
+    assert get_colormap_base('test_user1').colors[0, 0] == .25
+
+
+def test_rename(palette_dir):
+    _write(palette_dir, 'user2.txt', 'test_user2')
+    refresh_colormap_bases()
+    _write(palette_dir, 'user2.txt', 'test_user2renamed')
+    info = refresh_colormap_bases()
+    assert info == (['test_user2renamed'], [], ['test_user2'])
+    names = get_colormap_base_names()
+    assert 'test_user2renamed' in names
+    assert 'test_user2' not in names
+
+
+def test_replace_removed_name(palette_dir):
+    _write(palette_dir, 'user1.txt', 'test_user1')
+    refresh_colormap_bases()
+    _delete(palette_dir, 'user1.txt')
+    _write(palette_dir, 'other.txt', 'test_user1', value=.5)
+    info = refresh_colormap_bases()
+    assert info == ([], ['test_user1'], [])
+    assert get_colormap_base('test_user1').colors[0, 0] == .5
+
+
+def test_user_override(palette_dir):
+    _write(palette_dir, 'user1.txt', 'test_user1')
+    refresh_colormap_bases()
+    base = ColormapBase('test_user1', np.ones([2, 3]))
+    register_colormap_base(base, overwrite=True)
+    try:
+        _write(palette_dir, 'user1.txt', 'test_user1', value=.25)
+        info = refresh_colormap_bases()
+        assert info == ([], [], [])
+        assert get_colormap_base('test_user1') is base
+    finally:
+        _REGISTRY.update(remove=['test_user1'])
+
+
+def test_name_clash_aborts(palette_dir):
+    _write(palette_dir, 'user1.txt', 'test_user1')
+    refresh_colormap_bases()
+    generation = _REGISTRY.generation
+    _write(palette_dir, 'clash.txt', 'rainbow')
+    _write(palette_dir, 'user3.txt', 'test_user3')
+    with pytest.raises(ValueError):
+        refresh_colormap_bases()
+    assert _REGISTRY.generation == generation
+    assert 'test_user3' not in get_colormap_base_names()
+    assert get_colormap_base('rainbow').ncolors != 3
+    # Once the clash is resolved the other changes are picked up.
+    _delete(palette_dir, 'clash.txt')
+    info = refresh_colormap_bases()
+    assert info == (['test_user3'], [], [])
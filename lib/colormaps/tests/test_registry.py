@@ -0,0 +1,52 @@
+"""Tests for the registry of colormap bases."""
+# Copyright (c) 2012 Andrew Dawson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+from __future__ import absolute_import
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+
+from colormaps import get_colormap_base
+from colormaps.colormaps import (_PACKAGE_DIR,
+                                 _REGISTRY,
+                                 _LazyColormapBase,
+                                 _load_base,)
+
+
+def test_concurrent_first_load():
+    name = 'test_concurrent_first_load'
+    placeholder = _LazyColormapBase(name, os.path.join(
+        _PACKAGE_DIR, 'palette', 'ncl', 'ncl_amwg256.txt'))
+    _REGISTRY.update([placeholder])
+    try:
+        barrier = threading.Barrier(8)
+
+        def load(_):
+            barrier.wait()
+            return get_colormap_base(name)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            bases = list(executor.map(load, range(8)))
+        assert len(set(map(id, bases))) == 1
+        assert _REGISTRY[name] is bases[0]
+        # A placeholder from an older snapshot gives the same base.
+        assert _load_base(placeholder) is bases[0]
+    finally:
+        _REGISTRY.update(remove=[name])
@@ -18,7 +18,11 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
+from distutils.command.build_py import build_py
 from distutils.core import setup
+import os
+import subprocess
+import sys
 
 
 for line in open('lib/colormaps/__init__.py').readlines():
@@ -30,6 +34,32 @@ package_data = {'colormaps': ['palette/*.txt', 'palette/ncl/*.txt',
                               'palette/brewer/qualitative/*.txt',
                               'palette/brewer/sequential/*.txt']}
 
+
+
+class build_py_bundle(build_py):
+    """Build the package, and compile its palette files into the bundle
+    that is memory-mapped at import time."""
+
+    def run(self):
+        build_py.run(self)
+        package_dir = os.path.join(self.build_lib, 'colormaps')
+        bundle_file = os.path.join(package_dir, 'palette.bundle')
+        self.announce('compiling palette files into ' + bundle_file, 2)
+        if self.dry_run:
+            return
+        env = dict(os.environ, PYTHONPATH=os.path.abspath(self.build_lib))
+        env.pop('PYTHON_COLORMAPS', None)
+        try:
+            subprocess.check_call([sys.executable, '-m', 'colormaps.compile',
+                                   '-o', bundle_file, '-d',
+                                   os.path.join(package_dir, 'palette')],
+                                  env=env)
+        except (OSError, subprocess.CalledProcessError):
+            # The bundle only speeds up importing, so install without it
+            # (e.g. if numpy is not installed yet).
+            self.warn('could not compile the palette bundle')
+
+
 if __name__ == '__main__':
     setup(
         name='colormaps',
@@ -43,6 +73,7 @@ if __name__ == '__main__':
         base colors. It is designed to allow total control of colormaps
         in matplotlib.
         """,
-        packages=['colormaps'],
+        packages=['colormaps', 'colormaps.tests'],
         package_dir={'': 'lib'},
-        package_data=package_data,)
+        package_data=package_data,
+        cmdclass={'build_py': build_py_bundle},)